@@ -1,34 +1,113 @@
 #!/usr/bin/env python
 
+import argparse
 import csv
-import easyocr
+import glob
+import hashlib
+import io
+import json
+import multiprocessing
+import numpy as np
+import os
 import platform
 import pytesseract
+import queue
 import re
-import sys
+import socketserver
+import sqlite3
+import threading
+import time
 import warnings
-from decouple import config
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from decouple import Csv, config
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from multiprocessing import shared_memory
 from pathlib import Path
-from PIL import Image
-
-try:
-    import torch
-    TORCH_AVAILABLE = True
-except ImportError:
-    TORCH_AVAILABLE = False
+from PIL import Image, ImageFilter
+from utils import metrics
 
 file_name = config("FILE_NAME", default="extracted_usernames.csv")
+ocr_workers = config("OCR_WORKERS", default=os.cpu_count() or 1, cast=int)
+concurrent_engines = config("OCR_CONCURRENT_ENGINES", default=True, cast=bool)
+easyocr_model = config("EASYOCR_MODEL", default="DBNet")
+easyocr_quantize = config("EASYOCR_QUANTIZE", default="false", cast=bool)
+tesseract_psm = config("TESSERACT_PSM", default=3, cast=int)
+tesseract_backend = config("TESSERACT_BACKEND", default="auto")
+tesseract_profile = config("TESSERACT_PROFILE", default="default")
+ocr_preprocess = config("OCR_PREPROCESS", default=False, cast=bool)
+ocr_target_text_height = config("OCR_TARGET_TEXT_HEIGHT", default=32, cast=int)
+ocr_binarize = config("OCR_BINARIZE", default=True, cast=bool)
+ocr_sharpen = config("OCR_SHARPEN", default=False, cast=bool)
+ocr_roi = config("OCR_ROI", default=False, cast=bool)
+ocr_roi_padding = config("OCR_ROI_PADDING", default=4, cast=int)
+easyocr_batch_size = config("EASYOCR_BATCH_SIZE", default=1, cast=int)
+easyocr_processes = config("EASYOCR_PROCESSES", default=0, cast=int)
+ocr_engines = config("OCR_ENGINES", default="pytesseract,easyocr", cast=Csv())
+server_concurrency = config("OCR_SERVER_CONCURRENCY", default=2, cast=int)
+server_queue_size = config("OCR_SERVER_QUEUE_SIZE", default=32, cast=int)
+server_max_bytes = config("OCR_SERVER_MAX_BYTES", default=20 * 1024 * 1024, cast=int)
+ocr_cache_enabled = config("OCR_CACHE", default=True, cast=bool)
+ocr_cache_path = config("OCR_CACHE_PATH", default=".ocr_cache.sqlite3")
+ocr_cache_max_bytes = config("OCR_CACHE_MAX_BYTES", default=256 * 1024 * 1024, cast=int)
+
+# File extensions picked up when a directory or glob is passed on the command line
+IMAGE_EXTENSIONS = {".bmp", ".gif", ".jpeg", ".jpg", ".png", ".tif", ".tiff", ".webp"}
+
+# Batched EasyOCR pads images up to a multiple of this many pixels per side,
+# so near-identical screenshot sizes share a batch
+EASYOCR_BATCH_BUCKET = 64
+
+# Tesseract settings selected by TESSERACT_PROFILE. "handles" only reads the
+# characters a handle can contain, as sparse text with the LSTM engine alone
+# and without the dictionaries that "correct" handles into English words
+TESSERACT_PROFILES = {
+    "default": {},
+    "handles": {
+        "psm": 11,
+        "oem": 1,
+        "variables": {
+            "tessedit_char_whitelist": "@._0123456789"
+                                       "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ",
+            "load_system_dawg": "0",
+            "load_freq_dawg": "0",
+        },
+    },
+}
 
 # Suppress PyTorch MPS pin_memory warning on macOS
 warnings.filterwarnings("ignore", message=".*pin_memory.*not supported on MPS.*")
 
 # Global EasyOCR reader instance
 _easyocr_reader = None
+_easyocr_reader_lock = threading.Lock()
+
+# Serialize EasyOCR inference; torch already spreads each call across cores
+_easyocr_inference_lock = threading.Lock()
+
+# EasyOCR worker processes, each with its own reader, when EASYOCR_PROCESSES is set
+_easyocr_pool = None
+_easyocr_pool_lock = threading.Lock()
+
+# Set inside each worker process, see get_easyocr_pool()
+_easyocr_process_barrier = None
+
+# Idle in-process Tesseract handles per profile, reused by whichever thread needs one next
+_tesserocr_pools = {}
+_tesserocr_pools_lock = threading.Lock()
+_tesserocr_available = None
+
+# Global OCR result cache instance
+_ocr_cache = None
+_ocr_cache_lock = threading.Lock()
 
 
 def detect_optimal_device():
     """Detect the optimal device for EasyOCR processing."""
-    if not TORCH_AVAILABLE:
+    # Imported lazily so tesseract-only runs never pay for torch
+    try:
+        import torch
+    except ImportError:
         return False, "CPU (PyTorch not available)"
 
     # Check for Apple Silicon MPS support
@@ -63,12 +142,21 @@ USERNAME_PATTERN = re.compile(r"""
 def get_easyocr_reader():
     """Get EasyOCR reader instance with MPS optimization and model selection."""
     global _easyocr_reader
-    if _easyocr_reader is None:
+    if _easyocr_reader is not None:
+        return _easyocr_reader
+
+    with _easyocr_reader_lock:
+        if _easyocr_reader is not None:
+            return _easyocr_reader
+
+        # Imported lazily so tesseract-only runs never pay for easyocr and torch
+        import easyocr
+
         # Auto-detect optimal device or use config override
         optimal_gpu, device_info = detect_optimal_device()
         use_gpu = config("EASYOCR_GPU", default=str(optimal_gpu), cast=bool)
-        use_quantization = config("EASYOCR_QUANTIZE", default="false", cast=bool)
-        model = config("EASYOCR_MODEL", default="DBNet")
+        use_quantization = easyocr_quantize
+        model = easyocr_model
 
         print(f"EasyOCR Device: {device_info}")
         print(f"Initializing EasyOCR with GPU={use_gpu}, Quantization={use_quantization}, Model={model}")
@@ -85,145 +173,1215 @@ def get_easyocr_reader():
     return _easyocr_reader
 
 
-def extract_usernames_pytesseract(image_path):
+def get_tesseract_backend():
     """
-    Extract usernames using Pytesseract OCR.
+    Resolve TESSERACT_BACKEND to the backend that will actually run.
 
-    Args:
-        image_path (str): Path to the image file
+    "auto" and "tesserocr" use tesserocr's in-process API when it is
+    installed, falling back to pytesseract's tesseract subprocess otherwise.
+    """
+    global _tesserocr_available
+    if tesseract_backend not in ("auto", "tesserocr"):
+        return "pytesseract"
+
+    if _tesserocr_available is None:
+        try:
+            import tesserocr  # noqa: F401
+            _tesserocr_available = True
+        except ImportError:
+            _tesserocr_available = False
+            if tesseract_backend == "tesserocr":
+                print("tesserocr not installed, falling back to pytesseract")
+    return "tesserocr" if _tesserocr_available else "pytesseract"
+
+
+def get_tesseract_profile():
+    """
+    Resolve TESSERACT_PROFILE to its settings.
 
     Returns:
-        list: List of usernames found
+        tuple: Page segmentation mode (TESSERACT_PSM unless the profile sets
+            one), OCR engine mode or None for tesseract's default, and a
+            dict of tesseract variables
+    """
+    if tesseract_profile not in TESSERACT_PROFILES:
+        raise ValueError(
+            f"Unknown tesseract profile: {tesseract_profile} (choose from {', '.join(TESSERACT_PROFILES)})"
+        )
+    profile = TESSERACT_PROFILES[tesseract_profile]
+    return profile.get("psm", tesseract_psm), profile.get("oem"), profile.get("variables", {})
+
+
+def tesseract_config():
+    """Command line flags passing the current profile to the tesseract binary."""
+    psm, oem, variables = get_tesseract_profile()
+    flags = [f"--psm {psm}"]
+    if oem is not None:
+        flags.append(f"--oem {oem}")
+    flags.extend(f"-c {name}={value}" for name, value in variables.items())
+    return " ".join(flags)
+
+
+@contextmanager
+def tesserocr_api():
+    """
+    Borrow a persistent Tesseract handle for one recognition.
+
+    Handles load the language model once and are returned to a shared pool
+    afterwards, so any thread can reuse them and only as many exist as
+    images are ever recognized at the same time. Engine mode and dictionary
+    settings only apply when a handle is created, so each profile has its
+    own pool.
     """
+    psm, oem, variables = get_tesseract_profile()
+    with _tesserocr_pools_lock:
+        pool = _tesserocr_pools.setdefault(tesseract_profile, queue.SimpleQueue())
+
+    try:
+        api = pool.get_nowait()
+    except queue.Empty:
+        import tesserocr
+        options = {"lang": "eng", "variables": dict(variables)}
+        if oem is not None:
+            options["oem"] = oem
+        api = tesserocr.PyTessBaseAPI(**options)
     try:
-        # Open the image
-        image = Image.open(image_path)
+        api.SetPageSegMode(psm)
+        yield api
+    finally:
+        api.Clear()
+        pool.put(api)
+
+
+def _init_easyocr_process(threads, barrier):
+    """Load the reader in a new EasyOCR worker process, with its share of the cores."""
+    global _easyocr_process_barrier
+    import torch
+    torch.set_num_threads(threads)
+    get_easyocr_reader()
+    _easyocr_process_barrier = barrier
+
+
+def _wait_for_easyocr_processes():
+    """Hold a worker until every worker has loaded its reader, so each takes one of these."""
+    _easyocr_process_barrier.wait()
+    return os.getpid()
+
+
+def _easyocr_process_task(task, shm_name, shape, dtype, *args):
+    """
+    Run EasyOCR inside a worker process on pixels in shared memory.
+
+    The "detect" task returns the text boxes, "recognize" returns the joined
+    text for the given boxes, and "read" does both in one round trip.
+    """
+    shm = shared_memory.SharedMemory(name=shm_name)
+    pixels = None
+    try:
+        pixels = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+        reader = get_easyocr_reader()
+        if task in ("detect", "read"):
+            horizontal_list, free_list = reader.detect(pixels)
+            args = (horizontal_list[0], free_list[0])
+            if task == "detect":
+                return args
+            if not args[0] and not args[1]:
+                return ""
+        return ' '.join([result[1] for result in reader.recognize(pixels, *args)])
+    finally:
+        # The buffer can't be closed while an array still points into it
+        del pixels
+        shm.close()
+
+
+def get_easyocr_pool():
+    """
+    Get the pool of EasyOCR worker processes, starting it on first use.
+
+    Each of the EASYOCR_PROCESSES workers holds its own reader and gets an
+    equal share of the CPU cores for torch, so images are recognized in
+    parallel without oversubscribing the machine.
+    """
+    global _easyocr_pool
+    if _easyocr_pool is not None:
+        return _easyocr_pool
+
+    with _easyocr_pool_lock:
+        if _easyocr_pool is None:
+            threads = max(1, (os.cpu_count() or 1) // easyocr_processes)
+            print(f"Starting {easyocr_processes} EasyOCR processes with {threads} torch thread(s) each")
+            # Spawn rather than fork, as forking a threaded process with torch loaded can deadlock
+            context = multiprocessing.get_context("spawn")
+            pool = ProcessPoolExecutor(
+                max_workers=easyocr_processes,
+                mp_context=context,
+                initializer=_init_easyocr_process,
+                initargs=(threads, context.Barrier(easyocr_processes)),
+            )
+            # Workers only start as tasks arrive, so hand one to each and wait
+            # until all of them have their reader loaded
+            waits = [pool.submit(_wait_for_easyocr_processes) for _ in range(easyocr_processes)]
+            for wait in waits:
+                wait.result()
+            _easyocr_pool = pool
+    return _easyocr_pool
+
+
+def shutdown_easyocr_pool():
+    """Stop the EasyOCR worker processes, if they were started."""
+    global _easyocr_pool
+    with _easyocr_pool_lock:
+        if _easyocr_pool is not None:
+            _easyocr_pool.shutdown()
+            _easyocr_pool = None
+
+
+def run_easyocr_process(pixels, task, *args):
+    """
+    Run an EasyOCR task in a worker process.
+
+    The pixels are copied once into a shared memory block that the worker
+    reads in place, rather than being pickled across the process boundary.
+    """
+    pixels = np.ascontiguousarray(pixels)
+    shm = shared_memory.SharedMemory(create=True, size=max(1, pixels.nbytes))
+    try:
+        shared = np.ndarray(pixels.shape, dtype=pixels.dtype, buffer=shm.buf)
+        shared[...] = pixels
+        del shared
+        future = get_easyocr_pool().submit(
+            _easyocr_process_task, task, shm.name, pixels.shape, pixels.dtype.str, *args
+        )
+        return future.result()
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def load_easyocr():
+    """Load the EasyOCR reader up front, or start the worker processes with EASYOCR_PROCESSES."""
+    if easyocr_processes > 0:
+        get_easyocr_pool()
+    else:
+        get_easyocr_reader()
+
+
+class DecodedImage:
+    """
+    An image read once and decoded at most once into an RGB pixel buffer.
+
+    The encoded bytes are hashed on load so OCR results can be cached by
+    content; decoding is deferred until an engine actually needs the pixels,
+    so images whose results are all cached are never decoded.
+    """
+
+    def __init__(self, data, source="<bytes>"):
+        self.source = source
+        self.digest = hashlib.sha256(data).hexdigest()
+        self.decode_time = 0.0
+        self._data = data
+        self._pixels = None
+        self._derived = {}
+        self._lock = threading.RLock()
+
+    @classmethod
+    def from_path(cls, image_path):
+        return cls(Path(image_path).read_bytes(), source=str(image_path))
+
+    @property
+    def pixels(self):
+        """RGB pixel buffer shared by every engine, decoded on first access."""
+        with self._lock:
+            if self._pixels is None:
+                start = time.perf_counter()
+                with metrics.timer("decode"), Image.open(io.BytesIO(self._data)) as image:
+                    self._pixels = np.asarray(image.convert("RGB"))
+                # The encoded bytes are no longer needed once decoded
+                self._data = None
+                self.decode_time = time.perf_counter() - start
+        return self._pixels
+
+    def derived(self, name, compute):
+        """Return compute(self), computed once per image and shared by every engine."""
+        with self._lock:
+            if name not in self._derived:
+                self._derived[name] = compute(self)
+            return self._derived[name]
+
+
+def load_image(image):
+    """Load an image path, passing already loaded images through untouched."""
+    if isinstance(image, DecodedImage):
+        return image
+    return DecodedImage.from_path(image)
+
+
+def to_grayscale(pixels):
+    """
+    Convert RGB pixels to 8-bit luma with dark text on a light background.
+
+    Dark-mode screenshots are inverted, since tesseract expects dark text.
+    """
+    # Integer BT.601 luma weights (77 + 150 + 29 = 256)
+    rgb = pixels.astype(np.uint16)
+    gray = ((rgb[..., 0] * 77 + rgb[..., 1] * 150 + rgb[..., 2] * 29) >> 8).astype(np.uint8)
+    if np.median(gray[::8, ::8]) < 128:
+        gray = 255 - gray
+    return gray
+
+
+def estimate_text_height(gray, bands=8):
+    """
+    Estimate the typical text line height of a grayscale image in pixels.
+
+    The image is split into vertical bands and the runs of consecutive rows
+    containing ink are measured in each band, so thumbnails beside the text
+    only skew the bands they occupy.
+
+    Args:
+        gray (numpy.ndarray): Grayscale pixels, dark text on light background
+        bands (int): Number of vertical bands to measure independently
+
+    Returns:
+        float | None: Median line height, or None if no text was found
+    """
+    height, width = gray.shape
+    band_width = width // bands
+    if band_width == 0:
+        return None
+
+    ink = gray[:, :band_width * bands] < 128
+    rows = ink.reshape(height, bands, band_width).any(axis=2)
+
+    # Pad each band with blank rows so every run has a start and an end
+    padded = np.zeros((bands, height + 2), dtype=np.int8)
+    padded[:, 1:-1] = rows.T
+    edges = np.diff(padded, axis=1)
+    runs = np.flatnonzero(edges == -1) - np.flatnonzero(edges == 1)
+
+    # Ignore specks and separators
+    runs = runs[runs >= 3]
+    if not runs.size:
+        return None
+    return float(np.median(runs))
+
+
+def otsu_threshold(gray):
+    """Pick the grey level that best separates text from background (Otsu)."""
+    histogram = np.bincount(gray.ravel(), minlength=256).astype(np.float64)
+    levels = np.arange(256)
+    weight_background = np.cumsum(histogram)
+    weight_foreground = weight_background[-1] - weight_background
+    cumulative_mean = np.cumsum(histogram * levels)
+    mean_background = cumulative_mean / np.maximum(weight_background, 1)
+    mean_foreground = (cumulative_mean[-1] - cumulative_mean) / np.maximum(weight_foreground, 1)
+    variance = weight_background * weight_foreground * (mean_background - mean_foreground) ** 2
+    return int(np.argmax(variance))
+
+
+def preprocess_pixels(pixels, target_text_height=None, binarize=None, sharpen=None):
+    """
+    Shrink a screenshot to the fewest pixels that still read cleanly.
+
+    Converts to grayscale, downscales so text lines are about
+    target_text_height pixels tall (never upscaling), then optionally
+    sharpens and binarizes.
+
+    Args:
+        pixels (numpy.ndarray): RGB pixels
+        target_text_height (int): Desired text line height, 0 to skip scaling
+        binarize (bool): Threshold to pure black and white
+        sharpen (bool): Apply an unsharp mask after scaling
+
+    Returns:
+        numpy.ndarray: Grayscale pixels
+    """
+    target_text_height = ocr_target_text_height if target_text_height is None else target_text_height
+    binarize = ocr_binarize if binarize is None else binarize
+    sharpen = ocr_sharpen if sharpen is None else sharpen
+
+    gray = to_grayscale(pixels)
+    image = Image.fromarray(gray)
+
+    text_height = estimate_text_height(gray) if target_text_height > 0 else None
+    if text_height and text_height > target_text_height:
+        scale = target_text_height / text_height
+        size = (max(1, round(image.width * scale)), max(1, round(image.height * scale)))
+        image = image.resize(size, Image.Resampling.LANCZOS)
+
+    if sharpen:
+        image = image.filter(ImageFilter.UnsharpMask(radius=2, percent=150, threshold=3))
+
+    gray = np.asarray(image)
+    if binarize:
+        gray = np.where(gray > otsu_threshold(gray), 255, 0).astype(np.uint8)
+    return gray
+
+
+def ocr_pixels(decoded):
+    """Pixels handed to the OCR engines, preprocessed once when OCR_PREPROCESS is on."""
+    if ocr_preprocess:
+        return decoded.derived("preprocessed", lambda image: preprocess_pixels(image.pixels))
+    return decoded.pixels
+
+
+class OCRCache:
+    """
+    On-disk cache of raw OCR text keyed by image content hash and engine config.
+
+    Entries live in a SQLite database and the least recently used ones are
+    evicted once the stored text exceeds max_bytes.
+    """
+
+    def __init__(self, path, max_bytes):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS ocr_cache ("
+            "key TEXT PRIMARY KEY, text TEXT NOT NULL, size INTEGER NOT NULL, accessed REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ocr_cache_accessed ON ocr_cache (accessed)")
+        self._conn.commit()
+        self._size, self._clock = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0), COALESCE(MAX(accessed), 0) FROM ocr_cache"
+        ).fetchone()
+
+    def _now(self):
+        """Strictly increasing access time, so LRU order holds within one clock tick."""
+        self._clock = max(time.time(), self._clock + 1e-6)
+        return self._clock
+
+    def get(self, key):
+        """Return the cached text for key, or None on a miss."""
+        with self._lock:
+            row = self._conn.execute("SELECT text FROM ocr_cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE ocr_cache SET accessed = ? WHERE key = ?", (self._now(), key))
+            self._conn.commit()
+            return row[0]
+
+    def set(self, key, text):
+        """Store text under key, evicting least recently used entries as needed."""
+        size = len(text.encode("utf-8"))
+        with self._lock:
+            row = self._conn.execute("SELECT size FROM ocr_cache WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO ocr_cache (key, text, size, accessed) VALUES (?, ?, ?, ?)",
+                (key, text, size, self._now()),
+            )
+            self._size += size - (row[0] if row else 0)
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        """Drop least recently used entries until the cache fits in max_bytes."""
+        while self._size > self.max_bytes:
+            rows = self._conn.execute(
+                "SELECT key, size FROM ocr_cache ORDER BY accessed LIMIT 100"
+            ).fetchall()
+            if not rows:
+                break
+            for key, size in rows:
+                if self._size <= self.max_bytes:
+                    break
+                self._conn.execute("DELETE FROM ocr_cache WHERE key = ?", (key,))
+                self._size -= size
+
+
+def get_ocr_cache():
+    """Get the shared OCR cache, or None when caching is disabled."""
+    global _ocr_cache
+    if not ocr_cache_enabled:
+        return None
+    with _ocr_cache_lock:
+        if _ocr_cache is None:
+            _ocr_cache = OCRCache(ocr_cache_path, ocr_cache_max_bytes)
+    return _ocr_cache
+
+
+def engine_cache_key(engine):
+    """Describe the engine settings that affect OCR output, for cache keys."""
+    preprocess = "off"
+    if ocr_preprocess:
+        preprocess = f"{ocr_target_text_height}:{ocr_binarize}:{ocr_sharpen}"
+
+    if engine == "easyocr":
+        return f"easyocr:model={easyocr_model}:quantize={easyocr_quantize}:roi={ocr_roi}:preprocess={preprocess}"
+    if engine == "pytesseract":
+        psm, oem, _ = get_tesseract_profile()
+        key = (
+            f"pytesseract:backend={get_tesseract_backend()}:profile={tesseract_profile}:psm={psm}:oem={oem}"
+            f":roi={ocr_roi}:preprocess={preprocess}"
+        )
+        # Regions of interest come from the EasyOCR detector
+        return f"{key}:detector={easyocr_model}" if ocr_roi else key
+    return engine
+
+
+def ocr_cache_key(engine, image):
+    """Cache key for an engine's output on a loaded image."""
+    return f"{engine_cache_key(engine)}:{image.digest}"
+
+
+def cached_ocr_text(engine, image, ocr):
+    """
+    Return the raw OCR text for an image, consulting the OCR cache first.
+
+    Args:
+        engine (str): Engine name used in the cache key
+        image (str | DecodedImage): Path to the image file or a loaded image
+        ocr (callable): Function returning the OCR text for a DecodedImage
+
+    Returns:
+        str: Raw OCR text
+    """
+    decoded = load_image(image)
+    cache = get_ocr_cache()
+    if cache is None:
+        return ocr(decoded)
+
+    key = ocr_cache_key(engine, decoded)
+    text = cache.get(key)
+    metrics.inc("ocr_cache_lookups_total", engine=engine, result="miss" if text is None else "hit")
+    if text is None:
+        text = ocr(decoded)
+        cache.set(key, text)
+    return text
+
+
+def detect_text_regions(image):
+    """
+    Locate text lines with EasyOCR's detector alone, without recognizing them.
+
+    The boxes are computed once per image and shared by both engines.
+
+    Args:
+        image (str | DecodedImage): Path to the image file or a loaded image
+
+    Returns:
+        tuple: Horizontal boxes as [x_min, x_max, y_min, y_max] and
+            free-form quadrilaterals for rotated text
+    """
+    def detect(decoded):
+        pixels = ocr_pixels(decoded)
+        if easyocr_processes > 0:
+            with metrics.timer("easyocr_detect"):
+                return run_easyocr_process(pixels, "detect")
+
+        reader = get_easyocr_reader()
+        with _easyocr_inference_lock, metrics.timer("easyocr_detect"):
+            horizontal_list, free_list = reader.detect(pixels)
+        return horizontal_list[0], free_list[0]
+
+    return load_image(image).derived("text_regions", detect)
+
+
+def stack_text_regions(image, padding=ocr_roi_padding):
+    """
+    Crop the detected text lines of an image and stack them into one strip.
+
+    Thumbnails and whitespace are dropped, so tesseract only recognizes the
+    pixels that can hold a handle.
+
+    Args:
+        image (DecodedImage): Loaded image
+        padding (int): Pixels kept around each text line
 
-        # Perform OCR
-        text = pytesseract.image_to_string(image)
+    Returns:
+        numpy.ndarray | None: Stacked text lines, or None if no text was found
+    """
+    pixels = ocr_pixels(image)
+    height, width = pixels.shape[:2]
+    horizontal_list, free_list = detect_text_regions(image)
+
+    boxes = [list(box) for box in horizontal_list]
+    for points in free_list:
+        xs = [point[0] for point in points]
+        ys = [point[1] for point in points]
+        boxes.append([min(xs), max(xs), min(ys), max(ys)])
+
+    crops = []
+    for x_min, x_max, y_min, y_max in sorted(boxes, key=lambda box: (box[2], box[0])):
+        crop = pixels[
+            max(0, int(y_min) - padding):min(height, int(y_max) + padding),
+            max(0, int(x_min) - padding):min(width, int(x_max) + padding),
+        ]
+        if crop.size:
+            crops.append(crop)
+    if not crops:
+        return None
+
+    # Fill the gaps with the dominant background colour so no new edges appear
+    channels = pixels.shape[2:]
+    background = np.median(pixels[::16, ::16].reshape(-1, *channels), axis=0).astype(np.uint8)
+    gap = max(2 * padding, 1)
+    strip = np.empty(
+        (sum(crop.shape[0] for crop in crops) + gap * (len(crops) + 1),
+         max(crop.shape[1] for crop in crops) + 2 * gap, *channels),
+        dtype=np.uint8,
+    )
+    strip[:] = background
 
-        # Find all matches using the global USERNAME_PATTERN
+    top = gap
+    for crop in crops:
+        strip[top:top + crop.shape[0], gap:gap + crop.shape[1]] = crop
+        top += crop.shape[0] + gap
+    return strip
+
+
+def find_usernames(text):
+    """Find unique usernames in OCR text, preserving order."""
+    # Find all matches using the global USERNAME_PATTERN
+    with metrics.timer("regex"):
         matches = USERNAME_PATTERN.findall(text)
 
-        # Remove duplicates while preserving order
-        unique_matches = list(dict.fromkeys(matches))
+    # Remove duplicates while preserving order
+    return list(dict.fromkeys(matches))
 
-        return unique_matches
 
-    except Exception as e:
-        print(f"Error with Pytesseract: {e}")
-        return []
+def _pytesseract_text(decoded):
+    """Run tesseract over a decoded image, or just its text lines with OCR_ROI, in process when possible."""
+    pixels = decoded.derived("text_strip", stack_text_regions) if ocr_roi else ocr_pixels(decoded)
+    if pixels is None:
+        return ""
 
+    backend = get_tesseract_backend()
+    with metrics.timer("tesseract", backend=backend):
+        if backend == "tesserocr":
+            with tesserocr_api() as api:
+                api.SetImage(Image.fromarray(pixels))
+                return api.GetUTF8Text()
+        return pytesseract.image_to_string(pixels, config=tesseract_config())
 
-def extract_usernames_easyocr(image_path):
+
+def _easyocr_text(decoded):
+    """Run EasyOCR over a decoded image and join the recognized text."""
+    pixels = ocr_pixels(decoded)
+    if easyocr_processes > 0 and not ocr_roi:
+        # Nothing else needs the boxes, so send the image to one worker once
+        with metrics.timer("easyocr_read"):
+            return run_easyocr_process(pixels, "read")
+
+    # Detect and recognize separately, as readtext() would, so each is timed
+    # and the detector boxes are shared with tesseract under OCR_ROI
+    horizontal_list, free_list = detect_text_regions(decoded)
+    if not horizontal_list and not free_list:
+        return ""
+    if easyocr_processes > 0:
+        with metrics.timer("easyocr_recognize"):
+            return run_easyocr_process(pixels, "recognize", horizontal_list, free_list)
+
+    reader = get_easyocr_reader()
+    with _easyocr_inference_lock, metrics.timer("easyocr_recognize"):
+        results = reader.recognize(pixels, horizontal_list, free_list)
+
+    # Combine all text
+    return ' '.join([result[1] for result in results])
+
+
+def extract_usernames_pytesseract(image):
     """
-    Extract usernames using EasyOCR with thread-safe reader.
+    Extract usernames using Pytesseract OCR.
 
     Args:
-        image_path (str): Path to the image file
+        image (str | DecodedImage): Path to the image file or a loaded image
 
     Returns:
         list: List of usernames found
     """
     try:
-        # Get thread-local EasyOCR reader for thread safety
-        reader = get_easyocr_reader()
+        # Perform OCR, reusing cached text for images seen before
+        text = cached_ocr_text("pytesseract", image, _pytesseract_text)
 
-        # Perform OCR
-        results = reader.readtext(image_path)
+        return find_usernames(text)
 
-        # Combine all text
-        text = ' '.join([result[1] for result in results])
+    except Exception as e:
+        print(f"Error with Pytesseract: {e}")
+        return []
 
-        # Find all matches using the global USERNAME_PATTERN
-        matches = USERNAME_PATTERN.findall(text)
 
-        # Remove duplicates while preserving order
-        unique_matches = list(dict.fromkeys(matches))
+def extract_usernames_easyocr(image):
+    """
+    Extract usernames using EasyOCR with thread-safe reader.
 
-        return unique_matches
+    Args:
+        image (str | DecodedImage): Path to the image file or a loaded image
+
+    Returns:
+        list: List of usernames found
+    """
+    try:
+        # Perform OCR, reusing cached text for images seen before
+        text = cached_ocr_text("easyocr", image, _easyocr_text)
+
+        return find_usernames(text)
 
     except Exception as e:
         print(f"Error with EasyOCR: {e}")
         return []
 
 
-def extract_usernames_simple(image_path):
+def extract_usernames_simple(image):
     """
     Simple function to extract usernames using only Pytesseract.
 
     Args:
-        image_path (str): Path to the image file
+        image (str | DecodedImage): Path to the image file or a loaded image
 
     Returns:
         list: List of usernames found
     """
     try:
-        image = Image.open(image_path)
-        text = pytesseract.image_to_string(image)
-
-        # Find all matches using the global USERNAME_PATTERN
-        matches = USERNAME_PATTERN.findall(text)
-
-        return list(dict.fromkeys(matches))
+        return find_usernames(cached_ocr_text("pytesseract", image, _pytesseract_text))
 
     except Exception as e:
         print(f"Error: {e}")
         return []
 
 
-def main():
-    # Check if image path is provided
-    if len(sys.argv) < 2:
-        print("Usage:\n\tpython main.py <image_path>")
-        print("Example:\n\tpython main.py screenshot.png")
-        print("Example:\n\tpython main.py tests/test.png")
-        exit(0)
+def _pad_to(pixels, shape):
+    """Pad a pixel buffer to shape by repeating its edge pixels."""
+    pad_height = shape[0] - pixels.shape[0]
+    pad_width = shape[1] - pixels.shape[1]
+    if not pad_height and not pad_width:
+        return pixels
+    padding = ((0, pad_height), (0, pad_width)) + ((0, 0),) * (pixels.ndim - 2)
+    return np.pad(pixels, padding, mode="edge")
 
-    image_path = sys.argv[1]
 
-    # Check if file exists, if not try in tests directory
-    if not Path(image_path).exists():
-        # Try looking in tests directory
-        test_path = Path("tests") / image_path
-        if test_path.exists():
-            image_path = str(test_path)
-            print(f"Found image in tests directory: {image_path}")
+def extract_usernames_easyocr_batch(images, batch_size=easyocr_batch_size):
+    """
+    Extract usernames from many images with batched EasyOCR inference.
+
+    Images are grouped by size, padded up to a shared bucket size, and fed to
+    EasyOCR's readtext_batched() batch_size images at a time so the detector
+    and recognizer amortize their kernel overhead across the whole batch.
+    Cached images are skipped entirely.
+
+    Args:
+        images (list): Image paths or loaded DecodedImage objects
+        batch_size (int): Number of images per inference batch
+
+    Returns:
+        list: List of usernames found for each image, in input order
+    """
+    decoded = [load_image(image) for image in images]
+    texts = [None] * len(decoded)
+    cache = get_ocr_cache()
+
+    # Group uncached images into size buckets that can share a batch
+    buckets = {}
+    for index, image in enumerate(decoded):
+        if cache is not None:
+            texts[index] = cache.get(ocr_cache_key("easyocr", image))
+            if texts[index] is not None:
+                continue
+        try:
+            height, width = ocr_pixels(image).shape[:2]
+        except Exception as e:
+            # Decoding is deferred, so an unreadable file first fails here
+            print(f"Error with EasyOCR: {image.source}: {e}")
+            texts[index] = ""
+            continue
+        shape = (-(-height // EASYOCR_BATCH_BUCKET) * EASYOCR_BATCH_BUCKET,
+                 -(-width // EASYOCR_BATCH_BUCKET) * EASYOCR_BATCH_BUCKET)
+        buckets.setdefault(shape, []).append(index)
+
+    for shape, indices in buckets.items():
+        for start in range(0, len(indices), max(1, batch_size)):
+            chunk = indices[start:start + max(1, batch_size)]
+            try:
+                reader = get_easyocr_reader()
+                batch = [_pad_to(ocr_pixels(decoded[index]), shape) for index in chunk]
+                with _easyocr_inference_lock, metrics.timer("easyocr_batch"):
+                    batch_results = reader.readtext_batched(batch, batch_size=batch_size)
+            except Exception as e:
+                print(f"Error with EasyOCR batch: {e}")
+                for index in chunk:
+                    texts[index] = ""
+                continue
+
+            for index, results in zip(chunk, batch_results):
+                # Combine all text
+                texts[index] = ' '.join([result[1] for result in results])
+                if cache is not None:
+                    cache.set(ocr_cache_key("easyocr", decoded[index]), texts[index])
+
+    return [find_usernames(text) for text in texts]
+
+
+def collect_image_paths(patterns):
+    """
+    Expand files, directories and glob patterns into a list of image paths.
+
+    Args:
+        patterns (list): Image files, directories or glob patterns
+
+    Returns:
+        list: Unique image paths in the order they were given
+    """
+    image_paths = []
+    for pattern in patterns:
+        path = Path(pattern)
+        if path.is_dir():
+            matches = sorted(p for p in path.rglob("*") if p.suffix.lower() in IMAGE_EXTENSIONS)
+        elif path.exists():
+            matches = [path]
+        elif any(char in pattern for char in "*?["):
+            matches = sorted(
+                Path(p) for p in glob.glob(pattern, recursive=True)
+                if Path(p).suffix.lower() in IMAGE_EXTENSIONS
+            )
+        elif (Path("tests") / pattern).exists():
+            # Fall back to the tests directory
+            matches = [Path("tests") / pattern]
+            print(f"Found image in tests directory: {matches[0]}")
         else:
-            print(f"Error: Image file '{sys.argv[1]}' not found.")
-            print(f"Tried: {sys.argv[1]} and {test_path}")
-            print("Available test image: tests/test.png")
-            exit(1)
+            matches = []
 
-    print(f"Processing image: {image_path}\n")
+        if not matches:
+            print(f"Warning: no images found for '{pattern}'")
+        image_paths.extend(str(p) for p in matches)
 
-    print("=== Processing OCR Engines ===")
+    return list(dict.fromkeys(image_paths))
 
-    print("--- Processing with Pytesseract ---")
-    pytesseract_results = extract_usernames_pytesseract(image_path)
 
-    print("--- Processing with EasyOCR ---")
-    easyocr_results = extract_usernames_easyocr(image_path)
+# Registry of OCR engines, in display order. Heavy dependencies are imported
+# the first time an engine runs, so unselected engines cost nothing.
+OCR_ENGINES = {
+    "pytesseract": extract_usernames_pytesseract,
+    "easyocr": extract_usernames_easyocr,
+}
 
-    # Display results
-    print("\n=== Pytesseract Results ===")
-    if pytesseract_results:
-        print("Found usernames:")
-        for username in pytesseract_results:
-            print(f"  {username}")
+OCR_ENGINE_LABELS = {
+    "pytesseract": "Pytesseract",
+    "easyocr": "EasyOCR",
+}
+
+
+def select_engines(names=None):
+    """
+    Look up OCR engines by name.
+
+    Args:
+        names (list): Engine names, defaulting to the OCR_ENGINES setting
+
+    Returns:
+        dict: Selected engine names mapped to their extraction functions
+    """
+    names = ocr_engines if names is None else names
+    unknown = [name for name in names if name not in OCR_ENGINES]
+    if unknown:
+        raise ValueError(f"Unknown OCR engine(s): {', '.join(unknown)}")
+    # Text lines come from EasyOCR's detector, which costs tesseract alone more than it saves
+    if ocr_roi and "easyocr" not in names:
+        raise ValueError("OCR_ROI needs the easyocr engine, whose detector finds the text lines")
+    return {name: extract for name, extract in OCR_ENGINES.items() if name in names}
+
+
+def uses_easyocr(engines=None):
+    """Whether the selected engines or settings need the EasyOCR reader."""
+    return "easyocr" in select_engines(engines)
+
+
+def _timed(func, *args):
+    """Call func(*args) and return its result with the elapsed seconds."""
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def process_image(image, concurrent=concurrent_engines, engines=None):
+    """
+    Extract usernames from a single image with every OCR engine.
+
+    The image is decoded once and the same pixel buffer is shared by every
+    engine. When concurrent is enabled the engines run on separate threads,
+    so the tesseract subprocess overlaps with EasyOCR inference and the
+    wall-clock time approaches the slowest engine rather than the sum of both.
+
+    Args:
+        image (str | DecodedImage): Path to the image file or a loaded image
+        concurrent (bool): Run the OCR engines at the same time
+        engines (dict): Engines to run, defaulting to select_engines()
+
+    Returns:
+        dict: Per-engine usernames, the combined unique usernames and timings
+    """
+    start = time.perf_counter()
+    return _combine_results(_run_engines(image, concurrent, engines), start)
+
+
+def _run_engines(image, concurrent=concurrent_engines, engines=None):
+    """Run the engines over one image, returning per-engine usernames and timings only."""
+    engines = select_engines() if engines is None else engines
+
+    # Load once and hand the same image to every engine
+    try:
+        image, load_time = _timed(load_image, image)
+    except Exception as e:
+        print(f"Error loading {image}: {e}")
+        return {"image": str(image), "timings": {"load": 0.0}}
+
+    if concurrent and len(engines) > 1:
+        with ThreadPoolExecutor(max_workers=len(engines)) as executor:
+            futures = {
+                name: executor.submit(_timed, extract, image)
+                for name, extract in engines.items()
+            }
+            outcomes = {name: future.result() for name, future in futures.items()}
     else:
-        print("No usernames found or Pytesseract not available.")
+        outcomes = {name: _timed(extract, image) for name, extract in engines.items()}
 
-    print("\n=== EasyOCR Results ===")
-    if easyocr_results:
-        print("Found usernames:")
-        for username in easyocr_results:
-            print(f"  {username}")
+    result = {"image": image.source, "timings": {"load": load_time, "decode": image.decode_time}}
+    for name, (usernames, elapsed) in outcomes.items():
+        result[name] = usernames
+        result["timings"][name] = elapsed
+    return result
+
+
+def _combine_results(result, start):
+    """Fill in the combined unique usernames and total time of a result, once per image."""
+    result["usernames"] = list(dict.fromkeys(
+        username for name in OCR_ENGINES for username in result.get(name, [])
+    ))
+    result["timings"]["total"] = time.perf_counter() - start
+    metrics.observe("image_seconds", result["timings"]["total"])
+    metrics.inc("usernames_found_total", len(result["usernames"]))
+    return result
+
+
+def process_images(image_paths, workers=ocr_workers, concurrent=concurrent_engines,
+                   batch_size=easyocr_batch_size, engines=None):
+    """
+    Extract usernames from many images using a pool of worker threads.
+
+    The EasyOCR reader, when needed, is loaded once up front and shared by
+    every worker, so model loading is paid once per batch rather than once per
+    image. With a batch_size above one, EasyOCR runs batched inference over
+    batch_size images at a time while the other engines work through the same
+    images on the pool.
+    With EASYOCR_PROCESSES set, EasyOCR instead runs in that many worker
+    processes, one image each, and batch_size is ignored.
+
+    Args:
+        image_paths (list): Paths to the image files
+        workers (int): Number of images processed concurrently
+        concurrent (bool): Run the OCR engines for each image at the same time
+        batch_size (int): Number of images per batched EasyOCR call
+        engines (list): Engine names to run, defaulting to the OCR_ENGINES setting
+
+    Yields:
+        dict: Result of process_image() for each image, in completion order
+    """
+    selected = select_engines(engines)
+    if uses_easyocr(engines):
+        load_easyocr()
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        # Worker processes already run EasyOCR in parallel, one image each
+        if batch_size <= 1 or "easyocr" not in selected or easyocr_processes > 0:
+            futures = [executor.submit(process_image, path, concurrent, selected) for path in image_paths]
+            for future in as_completed(futures):
+                yield future.result()
+            return
+
+        other_engines = {name: extract for name, extract in selected.items() if name != "easyocr"}
+        for offset in range(0, len(image_paths), batch_size):
+            start = time.perf_counter()
+            chunk = image_paths[offset:offset + batch_size]
+            images = []
+            for path in chunk:
+                try:
+                    images.append(load_image(path))
+                except Exception as e:
+                    print(f"Error loading {path}: {e}")
+                    yield _combine_results({"image": path, "timings": {"load": 0.0}}, start)
+
+            # Combined once EasyOCR's share is merged in, so each image is counted once
+            futures = [executor.submit(_run_engines, image, concurrent, other_engines) for image in images]
+            batch_usernames, batch_time = _timed(extract_usernames_easyocr_batch, images, batch_size)
+
+            for future, usernames in zip(futures, batch_usernames):
+                result = future.result()
+                result["easyocr"] = usernames
+                # Report each image's share of the batched inference time
+                result["timings"]["easyocr"] = batch_time / len(images)
+                yield _combine_results(result, start)
+
+
+def print_results(result):
+    """Print per-engine usernames for a processed image."""
+    for name, label in OCR_ENGINE_LABELS.items():
+        if name not in result:
+            continue
+
+        print(f"\n=== {label} Results: {result['image']} ===")
+        if result[name]:
+            print("Found usernames:")
+            for username in result[name]:
+                print(f"  {username}")
+        else:
+            print(f"No usernames found or {label} not available.")
+
+    timings = " | ".join(f"{name}: {elapsed:.2f}s" for name, elapsed in result["timings"].items())
+    print(f"\nTimings: {timings}")
+
+
+def save_usernames_csv(usernames, output_file=file_name):
+    """Save usernames to a CSV file ready for utils/channel_finder.py."""
+    with metrics.timer("csv_write"), open(output_file, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        # Write header
+        writer.writerow(['username', 'url', 'channel'])
+        # Write usernames with empty url and channel fields for now
+        for username in usernames:
+            writer.writerow([username, '', ''])
+
+
+class OCRRequestHandler(BaseHTTPRequestHandler):
+    """
+    HTTP handler for the OCR server.
+
+    POST /ocr with raw image bytes as the body returns the usernames found as
+    JSON, or 400 if the bytes aren't an image. GET /health reports whether the server is up and how busy it is,
+    and GET /metrics exports per-stage timings in the Prometheus text format.
+    """
+
+    server_version = "yt-ocr"
+
+    def do_GET(self):
+        if self.path == "/metrics":
+            body = metrics.prometheus_text().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        if self.path != "/health":
+            self._send_json(404, {"error": "Not found"})
+            return
+        self._send_json(200, {"status": "ok", "in_flight": self.server.in_flight})
+
+    def do_POST(self):
+        if self.path.split("?", 1)[0] != "/ocr":
+            self._send_json(404, {"error": "Not found"})
+            return
+
+        length = int(self.headers.get("Content-Length") or 0)
+        if length <= 0:
+            self._send_json(400, {"error": "Request body must contain image bytes"})
+            return
+        if length > server_max_bytes:
+            self._send_json(413, {"error": f"Image larger than {server_max_bytes} bytes"})
+            return
+        data = self.rfile.read(length)
+
+        # Check the header up front so a bad upload is a 400, not an empty result
+        try:
+            with Image.open(io.BytesIO(data)) as upload:
+                upload.verify()
+        except Exception as e:
+            self._send_json(400, {"error": f"Not a readable image: {e}"})
+            return
+
+        # Reject rather than queue without bound when the server is saturated
+        if not self.server.admission.acquire(blocking=False):
+            self._send_json(503, {"error": "Server busy, try again"}, {"Retry-After": "1"})
+            return
+
+        try:
+            with self.server.in_flight_lock:
+                self.server.in_flight += 1
+            with self.server.workers:
+                image = DecodedImage(data, source=self.headers.get("X-Filename", "<upload>"))
+                result = process_image(image, concurrent=concurrent_engines)
+        except Exception as e:
+            self._send_json(500, {"error": str(e)})
+            return
+        finally:
+            with self.server.in_flight_lock:
+                self.server.in_flight -= 1
+            self.server.admission.release()
+
+        self._send_json(200, result)
+
+    def _send_json(self, status, payload, headers=None):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def address_string(self):
+        # Unix socket clients have no address
+        return self.client_address[0] if self.client_address else "unix"
+
+
+class ThreadingUnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Threaded HTTP server listening on a Unix domain socket."""
+
+    daemon_threads = True
+
+
+def make_server(host="127.0.0.1", port=8765, socket_path=None,
+                concurrency=server_concurrency, queue_size=server_queue_size):
+    """
+    Create an OCR server with the selected engines' models already loaded.
+
+    At most concurrency images are OCRed at once, up to queue_size more wait
+    their turn, and anything beyond that is turned away with a 503.
+
+    Args:
+        host (str): Interface to listen on when no socket_path is given
+        port (int): TCP port to listen on, 0 for any free port
+        socket_path (str): Unix domain socket to listen on instead of TCP
+        concurrency (int): Images processed at the same time
+        queue_size (int): Requests allowed to wait for a free worker
+
+    Returns:
+        socketserver.BaseServer: Server ready for serve_forever()
+    """
+    # Keep the models warm so requests never pay the load time
+    if uses_easyocr():
+        load_easyocr()
+
+    if socket_path:
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        server = ThreadingUnixHTTPServer(socket_path, OCRRequestHandler)
     else:
-        print("No usernames found or EasyOCR not available.")
+        server = ThreadingHTTPServer((host, port), OCRRequestHandler)
+
+    server.workers = threading.BoundedSemaphore(max(1, concurrency))
+    server.admission = threading.BoundedSemaphore(max(1, concurrency) + max(0, queue_size))
+    server.in_flight = 0
+    server.in_flight_lock = threading.Lock()
+    return server
+
+
+def serve(host="127.0.0.1", port=8765, socket_path=None):
+    """Run the OCR server until interrupted."""
+    server = make_server(host, port, socket_path)
+    address = socket_path or f"http://{host}:{server.server_address[1]}"
+    print(f"Serving OCR on {address} (POST image bytes to /ocr)")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nShutting down OCR server")
+    finally:
+        server.server_close()
+        if socket_path and os.path.exists(socket_path):
+            os.unlink(socket_path)
+
+
+def main():
+    global ocr_cache_enabled, ocr_engines, ocr_preprocess, ocr_roi
+
+    parser = argparse.ArgumentParser(
+        description="Extract YouTube usernames from screenshots",
+        epilog=(
+            "examples:\n"
+            "  python main.py tests/test.png\n"
+            "  python main.py screenshots/ --workers 8\n"
+            "  python main.py screenshots/ --engine pytesseract\n"
+            "  python main.py 'screenshots/**/*.png'\n"
+            "  python main.py --serve --port 8765"
+        ),
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("images", nargs="*", help="Image files, directories or glob patterns")
+    parser.add_argument(
+        "-e", "--engine", action="append", choices=list(OCR_ENGINES), dest="engines",
+        help=f"OCR engine to run, repeat for several (default: {','.join(ocr_engines)})",
+    )
+    parser.add_argument(
+        "-w", "--workers", type=int, default=ocr_workers,
+        help=f"Number of images processed concurrently (default: {ocr_workers})",
+    )
+    parser.add_argument(
+        "-b", "--batch-size", type=int, default=easyocr_batch_size,
+        help=f"Images per batched EasyOCR call, 1 disables batching (default: {easyocr_batch_size})",
+    )
+    parser.add_argument(
+        "--sequential", action="store_true",
+        help="Run the OCR engines one after another instead of concurrently",
+    )
+    parser.add_argument(
+        "--preprocess", action="store_true", default=ocr_preprocess,
+        help="Grayscale, downscale and binarize images before OCR",
+    )
+    parser.add_argument(
+        "--roi", action="store_true", default=ocr_roi,
+        help="Have tesseract only recognize the text lines EasyOCR detects (needs the easyocr engine)",
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true",
+        help="Always run OCR instead of reusing cached results",
+    )
+    parser.add_argument(
+        "-o", "--output", default=file_name,
+        help=f"CSV file to write usernames to (default: {file_name})",
+    )
+    parser.add_argument(
+        "--serve", action="store_true",
+        help="Run a local OCR server that keeps the models loaded between requests",
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="Server interface (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8765, help="Server port (default: 8765)")
+    parser.add_argument("--socket", help="Serve on a Unix domain socket instead of TCP")
+    args = parser.parse_args()
+    metrics.serve()
+
+    if args.no_cache:
+        ocr_cache_enabled = False
+    ocr_preprocess = args.preprocess
+    ocr_roi = args.roi
+    if args.engines:
+        ocr_engines = args.engines
+    try:
+        select_engines()
+    except ValueError as e:
+        parser.error(str(e))
+
+    if args.serve:
+        serve(args.host, args.port, args.socket)
+        return
+
+    if not args.images:
+        parser.print_usage()
+        exit(0)
+
+    image_paths = collect_image_paths(args.images)
+    if not image_paths:
+        print("Error: no images to process.")
+        print("Available test image: tests/test.png")
+        exit(1)
+
+    print(f"Processing {len(image_paths)} image(s) with {args.workers} worker(s)\n")
+
+    print("=== Processing OCR Engines ===")
+    results = {}
+    concurrent = concurrent_engines and not args.sequential
+    for result in process_images(image_paths, workers=args.workers, concurrent=concurrent,
+                                 batch_size=args.batch_size):
+        results[result["image"]] = result
+        print_results(result)
 
-    # Combine results from both OCR engines and remove duplicates
-    all_results = list(dict.fromkeys(pytesseract_results + easyocr_results))
+    # Combine results from every image and engine, preserving input order
+    all_results = list(dict.fromkeys(
+        username for image_path in image_paths for username in results[image_path]["usernames"]
+    ))
 
     print("\n=== Combined Unique Results ===")
     if all_results:
@@ -231,17 +1389,10 @@ def main():
         for username in all_results:
             print(f"  {username}")
 
-        # Save to CSV file
-        with open(file_name, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            # Write header
-            writer.writerow(['username', 'url', 'channel'])
-            # Write usernames with empty url and channel fields for now
-            for username in all_results:
-                writer.writerow([username, '', ''])
-        print(f"\nResults saved to '{file_name}'")
+        save_usernames_csv(all_results, args.output)
+        print(f"\nResults saved to '{args.output}'")
     else:
-        print("No usernames found in the image.")
+        print("No usernames found in the images.")
 
 
 if __name__ == "__main__":
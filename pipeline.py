@@ -0,0 +1,240 @@
+#!/usr/bin/env python
+
+import argparse
+import csv
+import queue
+import threading
+
+import main as ocr
+from utils import metrics
+from utils.channel_finder import (
+    FETCH_BACKENDS,
+    GLANCE_HEADER,
+    ChannelResult,
+    FirecrawlYouTubeScraper,
+    glance_entry,
+)
+
+
+"""
+Screenshots to Glance config in one streaming pass
+
+OCR workers hand each new username to resolver workers through a bounded
+queue as soon as it's read, so channel lookups overlap with OCR and the
+Glance config grows while screenshots are still being processed.
+
+Writes, as it goes:
+    extracted_usernames.csv               usernames in the order they were found
+    extracted_usernames_progress.jsonl    resolver journal, for resuming
+    extracted_usernames_scraped_glance.yml Glance videos widget, one line per channel
+
+Usage:
+    python pipeline.py screenshots/
+    python pipeline.py 'screenshots/**/*.png' --engine pytesseract --concurrency 8
+"""
+
+
+# Tells a resolver worker there are no more usernames
+DONE = object()
+
+
+def ocr_usernames(image_paths, usernames, csv_file, workers, concurrent, batch_size, engines=None):
+    """
+    OCR images, queueing each username the first time it's seen.
+
+    Usernames are appended to csv_file as they're found. The queue is
+    bounded, so OCR waits for the resolvers rather than racing ahead of them.
+    """
+    seen = set()
+    with open(csv_file, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["username", "url", "channel"])
+        f.flush()
+
+        for result in ocr.process_images(image_paths, workers, concurrent, batch_size, engines):
+            for username in result["usernames"]:
+                if username.lower() in seen:
+                    continue
+                seen.add(username.lower())
+                writer.writerow([username, "", ""])
+                f.flush()
+                usernames.put(username)
+
+
+def resolve_usernames(scraper, usernames, results):
+    """
+    Resolve queued usernames until DONE, reusing results loaded from the journal.
+
+    A lookup that raises becomes an error result, to be retried on the next
+    run, and DONE is always passed on so the pipeline never waits on a dead
+    resolver.
+    """
+    try:
+        while True:
+            username = usernames.get()
+            if username is DONE:
+                return
+
+            previous = scraper.channels.get(username)
+            if previous and previous.status in ("found", "not_found"):
+                results.put(previous)
+                continue
+
+            try:
+                result = scraper.scrape_channel_id(username)
+            except Exception as e:
+                result = ChannelResult(username, status="error", error_msg=str(e) or type(e).__name__)
+            results.put(result)
+    finally:
+        results.put(DONE)
+
+
+def run_pipeline(image_paths, scraper, csv_file, queue_size=64, workers=ocr.ocr_workers,
+                 concurrent=ocr.concurrent_engines, batch_size=ocr.easyocr_batch_size, engines=None):
+    """
+    Run OCR and channel resolution together.
+
+    Yields each ChannelResult as soon as it's resolved. Up to
+    scraper.concurrency usernames are resolved at once, all sharing the
+    scraper's rate limit. If OCR fails, the usernames already queued are
+    still resolved and yielded before the error is raised.
+    """
+    usernames = queue.Queue(maxsize=max(1, queue_size))
+    results = queue.Queue()
+    resolvers = max(1, scraper.concurrency)
+    ocr_errors = []
+
+    def produce():
+        try:
+            ocr_usernames(image_paths, usernames, csv_file, workers, concurrent, batch_size, engines)
+        except Exception as e:
+            ocr_errors.append(e)
+        finally:
+            for _ in range(resolvers):
+                usernames.put(DONE)
+
+    threads = [threading.Thread(target=produce, daemon=True)]
+    threads += [
+        threading.Thread(target=resolve_usernames, args=(scraper, usernames, results), daemon=True)
+        for _ in range(resolvers)
+    ]
+    for thread in threads:
+        thread.start()
+
+    finished = 0
+    while finished < resolvers:
+        result = results.get()
+        if result is DONE:
+            finished += 1
+            continue
+        yield result
+
+    if ocr_errors:
+        raise ocr_errors[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Extract YouTube usernames from screenshots and resolve them into a Glance config",
+    )
+    parser.add_argument("images", nargs="+", help="Image files, directories or glob patterns")
+    parser.add_argument(
+        "-e", "--engine", action="append", choices=list(ocr.OCR_ENGINES), dest="engines",
+        help=f"OCR engine to run, repeat for several (default: {','.join(ocr.ocr_engines)})",
+    )
+    parser.add_argument(
+        "-w", "--workers", type=int, default=ocr.ocr_workers,
+        help=f"Number of images processed concurrently (default: {ocr.ocr_workers})",
+    )
+    parser.add_argument(
+        "-b", "--batch-size", type=int, default=ocr.easyocr_batch_size,
+        help=f"Images per batched EasyOCR call, 1 disables batching (default: {ocr.easyocr_batch_size})",
+    )
+    parser.add_argument("--preprocess", action="store_true", default=ocr.ocr_preprocess,
+                        help="Grayscale, downscale and binarize images before OCR")
+    parser.add_argument("--roi", action="store_true", default=ocr.ocr_roi,
+                        help="Have tesseract only recognize the text lines EasyOCR detects (needs the easyocr engine)")
+    parser.add_argument(
+        "-o", "--output", default=ocr.file_name,
+        help=f"CSV file to write usernames to (default: {ocr.file_name})",
+    )
+    parser.add_argument(
+        "-q", "--queue-size", type=int, default=64,
+        help="Usernames waiting for a resolver before OCR pauses (default: 64)",
+    )
+    parser.add_argument(
+        "-c", "--concurrency", type=int, help="Usernames resolved at once (default: FIRECRAWL_CONCURRENCY or 4)"
+    )
+    parser.add_argument(
+        "-r", "--rate", type=float, help="Maximum requests per second, 0 for unlimited (default: FIRECRAWL_RATE)"
+    )
+    parser.add_argument("--backend", choices=FETCH_BACKENDS, help="How channel pages are fetched")
+    parser.add_argument("--base-url", help="Send httpx requests here instead of www.youtube.com")
+    parser.add_argument("--no-cache", action="store_true", help="Don't reuse cached OCR or channel results")
+    args = parser.parse_args()
+    metrics.serve()
+
+    ocr.ocr_preprocess = args.preprocess
+    ocr.ocr_roi = args.roi
+    try:
+        ocr.select_engines()
+    except ValueError as e:
+        parser.error(str(e))
+    if args.no_cache:
+        ocr.ocr_cache_enabled = False
+
+    image_paths = ocr.collect_image_paths(args.images)
+    if not image_paths:
+        print("Error: no images to process.")
+        exit(1)
+
+    scraper = FirecrawlYouTubeScraper(
+        args.output,
+        concurrency=args.concurrency,
+        rate=args.rate,
+        use_cache=False if args.no_cache else None,
+        backend=args.backend,
+        base_url=args.base_url,
+    )
+    scraper.load_progress()
+    scraper.print_info(
+        f"🚀 Processing {len(image_paths)} image(s) with {args.workers} OCR worker(s) "
+        f"and {scraper.concurrency} resolver(s)"
+    )
+
+    failed = False
+    try:
+        with open(scraper.glance_file, "w", encoding="utf-8") as glance:
+            glance.write(GLANCE_HEADER)
+            glance.flush()
+
+            for result in run_pipeline(image_paths, scraper, args.output, args.queue_size, args.workers,
+                                       ocr.concurrent_engines, args.batch_size, args.engines):
+                scraper.channels[result.username] = result
+                scraper.record_progress(result)
+                if result.status == "found":
+                    glance.write(glance_entry(result))
+                    glance.flush()
+                    scraper.print_success(f"{result.username} -> {result.channel_id}")
+                else:
+                    scraper.print_error(f"{result.username} -> {result.status}")
+    except KeyboardInterrupt:
+        scraper.print_info("\n⏹️  Pipeline interrupted. Progress saved.")
+    except Exception as e:
+        failed = True
+        scraper.print_error(f"Pipeline failed: {e}")
+    finally:
+        scraper.save_progress()
+        scraper.save_csv()
+        scraper.fetcher.close()
+
+    scraper.export_glance_config()
+    scraper.print_stats()
+    scraper.print_template_stats()
+    scraper.print_fetch_stats()
+    if failed:
+        exit(1)
+
+
+if __name__ == "__main__":
+    main()
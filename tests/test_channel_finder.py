@@ -0,0 +1,392 @@
+#!/usr/bin/env python
+
+import pytest
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add parent directory to path so we can import utils.channel_finder
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.channel_finder import (
+    URL_TEMPLATES,
+    ChannelCache,
+    ChannelResult,
+    ChannelTable,
+    CircuitBreaker,
+    FetchError,
+    FirecrawlYouTubeScraper,
+    HttpxFetcher,
+    RetryPolicy,
+    TokenBucket,
+    extract_channel_id,
+    extract_channel_id_from_chunks,
+    extract_channel_id_from_metadata,
+)
+from utils.fixture_server import make_server, synthetic_channel_id
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures" / "youtube"
+
+
+@pytest.fixture
+def scraper(monkeypatch, tmp_path):
+    """Scraper over an empty CSV with a dummy API key and no rate limit."""
+    monkeypatch.setenv("FIRECRAWL_API_KEY", "test-key")
+    monkeypatch.setenv("CHANNEL_CACHE_PATH", str(tmp_path / "channels.sqlite3"))
+    csv_file = tmp_path / "usernames.csv"
+    csv_file.write_text("username,url,channel\n", encoding="utf-8")
+    return FirecrawlYouTubeScraper(str(csv_file), rate=0)
+
+
+def test_token_bucket_limits_rate():
+    """Test that the token bucket spaces requests out to the configured rate."""
+    bucket = TokenBucket(rate=20, capacity=1)
+
+    start = time.monotonic()
+    for _ in range(5):
+        bucket.acquire()
+    elapsed = time.monotonic() - start
+
+    # The first token is free, the next four wait 1/20s each
+    assert elapsed >= 0.18
+
+
+def test_token_bucket_allows_bursts():
+    """Test that a burst up to capacity is not delayed, and rate 0 is unlimited."""
+    bucket = TokenBucket(rate=1, capacity=3)
+    assert [bucket.acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+
+    unlimited = TokenBucket(rate=0)
+    assert all(unlimited.acquire() == 0.0 for _ in range(100))
+
+
+def test_scrape_races_templates_and_adapts_order(scraper):
+    """Test that the first template to find the channel wins and moves up the order."""
+    channel_id = "UC" + "a" * 22
+    winner = "https://www.youtube.com/{handle}"
+
+    def fake_try_url(url):
+        time.sleep(0.01)
+        return (channel_id, "") if url == winner.format(handle="@someone") else (None, "")
+
+    scraper.try_url = fake_try_url
+    scraper.hedge = len(URL_TEMPLATES)
+
+    result = scraper.scrape_channel_id("@someone")
+
+    assert result.status == "found"
+    assert result.channel_id == channel_id
+    assert scraper.template_stats[winner]["wins"] == 1
+    assert scraper.ordered_templates()[0] == winner
+
+
+def test_handle_hit_beats_faster_legacy_name(scraper):
+    """Test that a legacy /c/ hit is only used once every @handle URL has missed, however fast it is."""
+    handle_id, legacy_id = "UC" + "l" * 22, "UC" + "m" * 22
+    scraper.hedge = len(URL_TEMPLATES)
+    handle_hits = {"@both": handle_id}
+
+    def fake_try_url(url):
+        if "/c/" in url:
+            return legacy_id, ""
+        time.sleep(0.05)
+        username = url.split("/")[3]
+        return (handle_hits.get(username), "") if url.endswith("/about") else (None, "")
+
+    scraper.try_url = fake_try_url
+
+    assert scraper.scrape_channel_id("@both").channel_id == handle_id
+    assert scraper.scrape_channel_id("@legacy").channel_id == legacy_id
+    assert all("{handle}" in template for template in scraper.ordered_templates()[:2])
+
+
+def test_channel_cache_expires_not_found(tmp_path):
+    """Test that found channels persist while not_found results expire."""
+    cache = ChannelCache(str(tmp_path / "channels.sqlite3"), not_found_ttl=0.05)
+    channel_id = "UC" + "b" * 22
+    cache.set(ChannelResult("@Found", channel_id, f"https://www.youtube.com/channel/{channel_id}", "found"))
+    cache.set(ChannelResult("@missing", status="not_found"))
+    cache.set(ChannelResult("@broken", status="error"))
+
+    assert cache.get("@found").channel_id == channel_id
+    assert cache.get("@missing").status == "not_found"
+    assert cache.get("@broken") is None
+
+    time.sleep(0.1)
+    assert cache.get("@missing") is None
+    assert cache.get("@Found").status == "found"
+
+
+def test_cached_username_skips_requests(scraper):
+    """Test that a cached username is resolved without calling Firecrawl."""
+    channel_id = "UC" + "c" * 22
+    scraper.cache.set(ChannelResult("@cached", channel_id, "", "found"))
+    scraper.try_url = lambda url: pytest.fail(f"Unexpected request to {url}")
+
+    assert scraper.scrape_channel_id("@cached").channel_id == channel_id
+
+
+def test_failed_lookups_are_not_cached(scraper):
+    """Test that a username whose every request failed is an error, not a cached not_found."""
+    scraper.retry_policy = RetryPolicy(retries=0)
+    scraper.circuit = CircuitBreaker(threshold=len(URL_TEMPLATES) + 1)
+
+    def fake_fetch(url):
+        raise FetchError("Payment required", status=402)
+
+    scraper.fetcher.fetch = fake_fetch
+    result = scraper.scrape_channel_id("@unlucky")
+
+    assert (result.status, result.error_msg) == ("error", "Payment required")
+    assert scraper.cache.get("@unlucky") is None
+
+
+def test_progress_journal_replays_after_crash(scraper):
+    """Test that journaled results survive a torn write and compact to one line each."""
+    channel_id = "UC" + "d" * 22
+    scraper.channels["@one"] = ChannelResult("@one", status="not_found")
+    scraper.record_progress(scraper.channels["@one"])
+    scraper.channels["@one"] = ChannelResult("@one", channel_id, "", "found")
+    scraper.record_progress(scraper.channels["@one"])
+    scraper.journal.write('{"username": "@tw')
+    scraper.journal.flush()
+
+    resumed = FirecrawlYouTubeScraper(scraper.csv_file, rate=0)
+    assert resumed.load_progress()
+    assert resumed.channels["@one"].channel_id == channel_id
+
+    resumed.save_progress()
+    with open(resumed.journal_file, encoding="utf-8") as f:
+        assert len(f.readlines()) == 1
+
+
+def test_extract_channel_id_prefers_external_id():
+    """Test that the page's own externalId wins over earlier links to other channels."""
+    html = (FIXTURES_DIR / "@fixturechannel.html").read_text(encoding="utf-8")
+
+    assert html.index("/channel/UC") < html.index('"externalId"')
+    assert extract_channel_id(html) == "UCfixtureChannel0000000A"
+    assert extract_channel_id('<a href="/channel/UC' + "e" * 22 + '">') == "UC" + "e" * 22
+    assert extract_channel_id('"externalId":"UCtooShort"') is None
+
+
+def test_canonical_link_only_read_from_head():
+    """Test that the page's canonical URL in its head wins, and one in the body is just a link."""
+    own, other = "UC" + "j" * 22, "UC" + "k" * 22
+    canonical = '<link rel="canonical" href="https://www.youtube.com/channel/{}">'
+    pages = [
+        f'<html><head>{canonical.format(own)}</head><body>"externalId":"{other}"</body></html>',
+        f'<html><head></head><body>{canonical.format(other)}"externalId":"{own}"</body></html>',
+    ]
+
+    for page in pages:
+        assert extract_channel_id(page) == own
+        assert extract_channel_id_from_chunks(page[start:start + 5] for start in range(0, len(page), 5)) == own
+
+
+def test_streamed_extraction_matches_whole_page():
+    """Test that chunked scanning finds markers split across chunk boundaries, in every fixture."""
+    for path in sorted(FIXTURES_DIR.glob("*.html")):
+        html = path.read_text(encoding="utf-8")
+        for size in (7, 64, 1000):
+            chunks = (html[start:start + size] for start in range(0, len(html), size))
+            assert extract_channel_id_from_chunks(chunks) == extract_channel_id(html)
+
+    # A canonical link in the head ends the scan before the body is read
+    html = (FIXTURES_DIR / "@canonicalchannel.html").read_text(encoding="utf-8")
+    read = []
+    chunks = (read.append(start) or html[start:start + 64] for start in range(0, len(html), 64))
+    assert extract_channel_id_from_chunks(chunks) == "UCcanonicalChannel00000B"
+    assert read[-1] < html.index("<body>")
+
+
+def test_fetch_strategies_fall_back_to_html(scraper):
+    """Test that the light metadata fetch is tried first and full HTML only on a miss."""
+    html = (FIXTURES_DIR / "@fixturechannel.html").read_text(encoding="utf-8")
+    channel_id = "UC" + "f" * 22
+    requests = []
+
+    def fake_scrape_url(url, formats, **options):
+        requests.append((url, formats[0]))
+        if formats == ["html"]:
+            return SimpleNamespace(success=True, html=html)
+        og_url = f"https://www.youtube.com/channel/{channel_id}" if "light" in url else url
+        return SimpleNamespace(success=True, markdown="", metadata={"ogUrl": og_url})
+
+    scraper.fetcher.firecrawl = SimpleNamespace(scrape_url=fake_scrape_url)
+
+    assert scraper.try_url("https://www.youtube.com/@light") == (channel_id, "")
+    assert scraper.try_url("https://www.youtube.com/@heavy") == ("UCfixtureChannel0000000A", "")
+    assert [fmt for _, fmt in requests] == ["markdown", "markdown", "html"]
+    assert scraper.fetcher.stats["metadata"]["hits"] == 1
+    assert scraper.fetcher.stats["html"]["bytes"] == len(html)
+    assert extract_channel_id_from_metadata({"og:url": ["https://www.youtube.com/@name"]}) is None
+
+
+@pytest.fixture
+def fixture_server():
+    """Fixture server on a free port, torn down after the test."""
+    servers = []
+
+    def start(**options):
+        server = make_server(port=0, **options)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def test_fixture_server_replays_pages(fixture_server):
+    """Test that saved pages are served by handle, behind the consent prompt, and synthesized."""
+    _, base_url = fixture_server(consent=True)
+    with urllib.request.urlopen(f"{base_url}/@fixturechannel") as response:
+        assert extract_channel_id(response.read().decode()) is None
+
+    _, base_url = fixture_server(synthesize=True)
+    with urllib.request.urlopen(f"{base_url}/@FixtureChannel/about") as response:
+        assert extract_channel_id(response.read().decode()) == "UCfixtureChannel0000000A"
+    with urllib.request.urlopen(f"{base_url}/c/someone") as response:
+        assert extract_channel_id(response.read().decode()) == synthetic_channel_id("someone")
+
+    _, base_url = fixture_server(rate_limit_rate=1.0, retry_after=2)
+    with pytest.raises(urllib.error.HTTPError) as excinfo:
+        urllib.request.urlopen(f"{base_url}/@fixturechannel")
+    assert excinfo.value.code == 429
+    assert excinfo.value.headers["Retry-After"] == "2"
+
+
+def test_httpx_fetcher_against_fixture_server(fixture_server):
+    """Test that the httpx backend resolves replayed pages and surfaces consent pages and 429s as errors."""
+    pytest.importorskip("httpx")
+    _, base_url = fixture_server(consent=True)
+    fetcher = HttpxFetcher(max_connections=2, max_per_host=1, base_url=base_url)
+    try:
+        assert fetcher.fetch("https://www.youtube.com/@fixturechannel") == "UCfixtureChannel0000000A"
+        assert fetcher.fetch("https://www.youtube.com/@missing") is None
+        assert fetcher.stats["httpx"]["hits"] == 1
+
+        # Without the consent cookies the prompt is served inline, which is an error rather than a miss
+        fetcher.client.cookies.clear()
+        with pytest.raises(FetchError, match="consent") as excinfo:
+            fetcher.fetch("https://www.youtube.com/@fixturechannel")
+        assert not RetryPolicy.is_transient(excinfo.value)
+        assert fetcher.host_slot("127.0.0.1").acquire(blocking=False)
+    finally:
+        fetcher.close()
+
+    _, base_url = fixture_server(rate_limit_rate=1.0, retry_after=3)
+    fetcher = HttpxFetcher(base_url=base_url)
+    try:
+        with pytest.raises(FetchError) as excinfo:
+            fetcher.fetch("https://www.youtube.com/@fixturechannel")
+        assert (excinfo.value.status, excinfo.value.retry_after) == (429, 3.0)
+    finally:
+        fetcher.close()
+
+
+def test_httpx_fetcher_page_refusals_are_misses():
+    """Test that the httpx backend treats 4xx for a page as misses, but 429 and 5xx as errors."""
+    httpx = pytest.importorskip("httpx")
+    fetcher = HttpxFetcher(http2=False)
+    # Each path is the status to answer with
+    respond = lambda request: httpx.Response(int(request.url.path[1:]))
+    fetcher.client = httpx.Client(transport=httpx.MockTransport(respond))
+    try:
+        for status in (400, 403, 404, 410):
+            assert fetcher.fetch(f"https://www.youtube.com/{status}") is None
+        for status in (429, 500, 503):
+            with pytest.raises(FetchError) as excinfo:
+                fetcher.fetch(f"https://www.youtube.com/{status}")
+            assert excinfo.value.status == status
+        assert fetcher.stats["httpx"] == {"requests": 4, "hits": 0, "bytes": 0}
+    finally:
+        fetcher.close()
+
+
+def test_retry_policy_by_error_class():
+    """Test that throttling and outages back off, honoring Retry-After up to the cap, and 4xx never retries."""
+    policy = RetryPolicy(retries=2, base_delay=1, max_delay=3)
+
+    assert policy.delay(FetchError("slow down", status=429, retry_after=2), 0) == 2
+    assert policy.delay(FetchError("slow down", status=429, retry_after=3600), 0) is None
+    assert 0 <= policy.delay(FetchError("HTTP 503", status=503), 1) <= 2
+    assert 0 <= policy.delay(FetchError("timed out"), 0) <= 1
+    assert policy.delay(FetchError("HTTP 503", status=503), 2) is None
+    assert policy.delay(FetchError("HTTP 403", status=403), 0) is None
+
+
+def test_circuit_breaker_pauses_until_probe_succeeds():
+    """Test that consecutive failures open the circuit and one probe closes it again."""
+    circuit = CircuitBreaker(threshold=2, cooldown=0.1)
+
+    assert not circuit.record_failure()
+    assert circuit.record_failure()
+    assert circuit.wait() >= 0.09
+
+    # The probe is let through alone, so another caller waits on its outcome
+    waited = []
+    waiter = threading.Thread(target=lambda: waited.append(circuit.wait()))
+    waiter.start()
+    time.sleep(0.05)
+    circuit.record_success()
+    waiter.join(1)
+
+    assert waited and circuit.opened_at is None
+    assert circuit.wait() < 0.01
+
+
+def test_try_url_retries_transient_errors(scraper):
+    """Test that 5xx responses are retried, and 403s and exhausted retries are errors."""
+    channel_id = "UC" + "g" * 22
+    scraper.retry_policy = RetryPolicy(retries=2, base_delay=0)
+    responses = {
+        "flaky": [FetchError("HTTP 503", status=503), channel_id],
+        "forbidden": [FetchError("HTTP 403", status=403), channel_id],
+        "down": [FetchError("HTTP 502", status=502)] * 3,
+    }
+
+    def fake_fetch(url):
+        response = responses[url].pop(0)
+        if isinstance(response, FetchError):
+            raise response
+        return response
+
+    scraper.fetcher.fetch = fake_fetch
+
+    assert scraper.try_url("flaky") == (channel_id, "")
+    assert scraper.try_url("forbidden") == (None, "HTTP 403")
+    assert scraper.try_url("down") == (None, "HTTP 502")
+    assert responses == {"flaky": [], "forbidden": [channel_id], "down": []}
+
+
+def test_channel_table_tracks_status_counts():
+    """Test that counts and the pending index follow results as they are replaced."""
+    channels = ChannelTable()
+    for username in ("@a", "@b", "@c"):
+        channels[username] = ChannelResult(username)
+
+    channels["@a"] = ChannelResult("@a", "UC" + "h" * 22, "", "found")
+    channels["@b"] = ChannelResult("@b", status="error")
+    del channels["@c"]
+
+    assert (len(channels), channels.count("found"), channels.count("pending")) == (2, 1, 0)
+    assert channels.pending_usernames() == ["@b"]
+    assert dict(channels.items())["@a"].status == "found"
+
+
+def test_stats_count_errors(scraper):
+    """Test that errored usernames, which are retried, show up in the stats."""
+    scraper.channels["@a"] = ChannelResult("@a", "UC" + "i" * 22, "", "found")
+    scraper.channels["@b"] = ChannelResult("@b", status="error")
+    scraper.channels["@c"] = ChannelResult("@c")
+
+    assert scraper.get_stats() == (3, 1, 1, 0, 1)
+    assert len(scraper.get_pending_channels()) == 2
@@ -1,13 +1,42 @@
 #!/usr/bin/env python
 
+import json
+import numpy as np
 import pytest
+import subprocess
 import sys
+import threading
+import urllib.error
+import urllib.request
 from pathlib import Path
 
 # Add parent directory to path so we can import main
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from main import extract_usernames_pytesseract, extract_usernames_easyocr
+from main import (
+    OCRCache,
+    collect_image_paths,
+    engine_cache_key,
+    estimate_text_height,
+    extract_usernames_easyocr,
+    extract_usernames_easyocr_batch,
+    extract_usernames_pytesseract,
+    get_tesseract_backend,
+    make_server,
+    otsu_threshold,
+    process_image,
+    process_images,
+    select_engines,
+    shutdown_easyocr_pool,
+    tesseract_config,
+)
+from utils import metrics
+
+
+@pytest.fixture(autouse=True)
+def no_ocr_cache(monkeypatch):
+    """Run the engines for real rather than reading text cached by earlier runs."""
+    monkeypatch.setattr("main.ocr_cache_enabled", False)
 
 
 @pytest.fixture
@@ -108,4 +137,243 @@ def test_combined_results_unique(test_image_path):
     assert len(combined) == len(set(combined)), "Combined results should have no duplicates"
     
     # Should contain usernames from both engines
-    assert len(combined) >= max(len(pytesseract_usernames), len(easyocr_usernames)), "Combined should be at least as long as longest individual result"
\ No newline at end of file
+    assert len(combined) >= max(len(pytesseract_usernames), len(easyocr_usernames)), "Combined should be at least as long as longest individual result"
+
+
+def test_collect_image_paths(tmp_path):
+    """Test that directories and globs expand to unique image paths."""
+    (tmp_path / "nested").mkdir()
+    for name in ["a.png", "b.JPG", "notes.txt", "nested/c.png"]:
+        (tmp_path / name).touch()
+
+    from_dir = collect_image_paths([str(tmp_path)])
+    assert sorted(Path(p).name for p in from_dir) == ["a.png", "b.JPG", "c.png"]
+
+    from_glob = collect_image_paths([str(tmp_path / "*.png"), str(tmp_path / "a.png")])
+    assert from_glob == [str(tmp_path / "a.png")]
+
+
+def test_process_image_concurrent_engines(test_image_path, expected_usernames):
+    """Test that running the engines concurrently combines and times both."""
+    if not test_image_path.exists():
+        pytest.skip("Test image not found")
+
+    result = process_image(str(test_image_path), concurrent=True)
+
+    assert set(result["usernames"]) == set(result["pytesseract"]) | set(result["easyocr"])
+    assert len(set(result["usernames"]).intersection(expected_usernames)) >= 5
+    assert set(result["timings"]) == {"load", "decode", "pytesseract", "easyocr", "total"}
+
+
+def test_ocr_cache_evicts_least_recently_used(tmp_path):
+    """Test that the OCR cache stays under its size bound, evicting LRU entries."""
+    cache = OCRCache(str(tmp_path / "cache.sqlite3"), max_bytes=25)
+
+    cache.set("a", "x" * 10)
+    cache.set("b", "y" * 10)
+    assert cache.get("a") == "x" * 10  # touch "a" so "b" is least recently used
+    cache.set("c", "z" * 10)
+
+    assert cache.get("a") == "x" * 10
+    assert cache.get("b") is None
+    assert cache.get("c") == "z" * 10
+
+
+def test_easyocr_batch_extraction(test_image_path, expected_usernames):
+    """Test that batched EasyOCR returns expected usernames for every image."""
+    if not test_image_path.exists():
+        pytest.skip("Test image not found")
+
+    batch_usernames = extract_usernames_easyocr_batch([str(test_image_path)] * 2, batch_size=2)
+
+    assert len(batch_usernames) == 2
+    for usernames in batch_usernames:
+        common_usernames = set(usernames).intersection(expected_usernames)
+        assert len(common_usernames) >= 5, f"Should extract at least 5 expected usernames, got {common_usernames}"
+
+
+def test_easyocr_batch_skips_corrupt_image(tmp_path, test_image_path, expected_usernames):
+    """Test that an unreadable image in a batch yields no usernames without failing the others."""
+    if not test_image_path.exists():
+        pytest.skip("Test image not found")
+
+    corrupt = tmp_path / "bad.png"
+    corrupt.write_bytes(b"not an image")
+    batch_usernames = extract_usernames_easyocr_batch([str(corrupt), str(test_image_path)], batch_size=2)
+
+    assert batch_usernames[0] == []
+    common_usernames = set(batch_usernames[1]).intersection(expected_usernames)
+    assert len(common_usernames) >= 5, f"Should extract at least 5 expected usernames, got {common_usernames}"
+
+
+def test_batched_images_recorded_once(monkeypatch, test_image_path):
+    """Test that batched EasyOCR records each image's time and usernames once."""
+    if not test_image_path.exists():
+        pytest.skip("Test image not found")
+
+    monkeypatch.setattr("main.load_easyocr", lambda: None)
+    monkeypatch.setattr("main.OCR_ENGINES", {"pytesseract": lambda image: ["@a"], "easyocr": lambda image: []})
+    monkeypatch.setattr("main.extract_usernames_easyocr_batch", lambda images, batch_size: [["@b"]] * len(images))
+
+    def recorded():
+        snapshot = metrics.snapshot()
+        return snapshot["histograms"].get("image_seconds", {}).get("count", 0), \
+            snapshot["counters"].get("usernames_found_total", 0)
+
+    images_before, usernames_before = recorded()
+    results = list(process_images([str(test_image_path)] * 2, 1, False, 2, ["pytesseract", "easyocr"]))
+    images_after, usernames_after = recorded()
+
+    assert [result["usernames"] for result in results] == [["@a", "@b"], ["@a", "@b"]]
+    assert (images_after - images_before, usernames_after - usernames_before) == (2, 4)
+
+
+@pytest.mark.parametrize("extract", [extract_usernames_pytesseract, extract_usernames_easyocr])
+def test_roi_extraction(monkeypatch, test_image_path, expected_usernames, extract):
+    """Test that recognizing only detected text lines keeps the expected usernames."""
+    if not test_image_path.exists():
+        pytest.skip("Test image not found")
+
+    monkeypatch.setattr("main.ocr_roi", True)
+    usernames = extract(str(test_image_path))
+
+    common_usernames = set(usernames).intersection(expected_usernames)
+    assert len(common_usernames) >= 5, f"Should extract at least 5 expected usernames, got {common_usernames}"
+
+
+def test_estimate_text_height_and_threshold():
+    """Test text height estimation and Otsu thresholding on synthetic lines."""
+    gray = np.full((400, 320), 240, dtype=np.uint8)
+    for top in range(20, 380, 60):
+        gray[top:top + 18, 10:300] = 20
+
+    assert estimate_text_height(gray) == 18
+    assert 20 <= otsu_threshold(gray) < 240
+
+
+@pytest.mark.parametrize("extract", [extract_usernames_pytesseract, extract_usernames_easyocr])
+def test_preprocessed_extraction(monkeypatch, test_image_path, expected_usernames, extract):
+    """Test that downscaled, binarized images keep the expected usernames."""
+    if not test_image_path.exists():
+        pytest.skip("Test image not found")
+
+    monkeypatch.setattr("main.ocr_preprocess", True)
+    usernames = extract(str(test_image_path))
+
+    common_usernames = set(usernames).intersection(expected_usernames)
+    assert len(common_usernames) >= 5, f"Should extract at least 5 expected usernames, got {common_usernames}"
+
+
+def test_tesserocr_backend(monkeypatch, test_image_path, expected_usernames):
+    """Test that the in-process Tesseract backend finds the expected usernames under its own cache key."""
+    pytest.importorskip("tesserocr")
+    if not test_image_path.exists():
+        pytest.skip("Test image not found")
+
+    monkeypatch.setattr("main.tesseract_backend", "tesserocr")
+    pools = {}
+    monkeypatch.setattr("main._tesserocr_pools", pools)
+    assert get_tesseract_backend() == "tesserocr"
+    tesserocr_key = engine_cache_key("pytesseract")
+
+    # One handle is created, then reused by later calls on other threads
+    results = [extract_usernames_pytesseract(str(test_image_path))]
+    worker = threading.Thread(target=lambda: results.append(extract_usernames_pytesseract(str(test_image_path))))
+    worker.start()
+    worker.join()
+
+    assert len(results) == 2
+    for usernames in results:
+        common_usernames = set(usernames).intersection(expected_usernames)
+        assert len(common_usernames) >= 5, f"Should extract at least 5 expected usernames, got {common_usernames}"
+    assert pools["default"].qsize() == 1
+
+    monkeypatch.setattr("main.tesseract_backend", "pytesseract")
+    assert engine_cache_key("pytesseract") != tesserocr_key
+
+
+def test_tesseract_handles_profile(monkeypatch, test_image_path, expected_usernames):
+    """Test that the handles profile configures tesseract for handles and keeps the expected usernames."""
+    monkeypatch.setattr("main.tesseract_profile", "handles")
+    flags = tesseract_config()
+    assert "--psm 11" in flags and "--oem 1" in flags
+    assert "-c load_system_dawg=0" in flags and "-c tessedit_char_whitelist=@._" in flags
+    assert "profile=handles:psm=11" in engine_cache_key("pytesseract")
+
+    if not test_image_path.exists():
+        pytest.skip("Test image not found")
+
+    usernames = extract_usernames_pytesseract(str(test_image_path))
+    common_usernames = set(usernames).intersection(expected_usernames)
+    assert len(common_usernames) >= 5, f"Should extract at least 5 expected usernames, got {common_usernames}"
+
+    monkeypatch.setattr("main.tesseract_profile", "nope")
+    with pytest.raises(ValueError):
+        tesseract_config()
+
+
+def test_easyocr_processes(monkeypatch, test_image_path, expected_usernames):
+    """Test that EasyOCR worker processes fed through shared memory find the expected usernames."""
+    if not test_image_path.exists():
+        pytest.skip("Test image not found")
+
+    monkeypatch.setattr("main.easyocr_processes", 2)
+    try:
+        for roi in (False, True):
+            monkeypatch.setattr("main.ocr_roi", roi)
+            usernames = extract_usernames_easyocr(str(test_image_path))
+            common_usernames = set(usernames).intersection(expected_usernames)
+            assert len(common_usernames) >= 5, f"Should extract at least 5 expected usernames, got {common_usernames}"
+    finally:
+        shutdown_easyocr_pool()
+
+
+def test_server_returns_usernames(test_image_path, expected_usernames):
+    """Test that the OCR server accepts image bytes and returns usernames as JSON."""
+    if not test_image_path.exists():
+        pytest.skip("Test image not found")
+
+    server = make_server(port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        request = urllib.request.Request(
+            f"http://127.0.0.1:{server.server_address[1]}/ocr",
+            data=test_image_path.read_bytes(),
+            headers={"X-Filename": test_image_path.name},
+        )
+        with urllib.request.urlopen(request) as response:
+            result = json.loads(response.read())
+        with urllib.request.urlopen(f"http://127.0.0.1:{server.server_address[1]}/metrics") as response:
+            exported = response.read().decode()
+        with pytest.raises(urllib.error.HTTPError) as bad_upload:
+            urllib.request.urlopen(f"http://127.0.0.1:{server.server_address[1]}/ocr", data=b"not an image")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert result["image"] == test_image_path.name
+    common_usernames = set(result["usernames"]).intersection(expected_usernames)
+    assert len(common_usernames) >= 5, f"Should extract at least 5 expected usernames, got {common_usernames}"
+    assert 'stage="decode"' in exported
+    assert bad_upload.value.code == 400
+
+
+def test_tesseract_only_import_skips_torch():
+    """Test that importing main and selecting pytesseract never loads easyocr or torch."""
+    code = (
+        "import sys, main; main.select_engines(['pytesseract']); "
+        "assert 'easyocr' not in sys.modules and 'torch' not in sys.modules"
+    )
+    subprocess.run([sys.executable, "-c", code], cwd=Path(__file__).parent.parent, check=True)
+
+
+def test_select_engines(monkeypatch):
+    """Test that engines are selected by name and unknown names, or OCR_ROI without EasyOCR, are rejected."""
+    assert list(select_engines(["easyocr", "pytesseract"])) == ["pytesseract", "easyocr"]
+    with pytest.raises(ValueError):
+        select_engines(["nope"])
+
+    monkeypatch.setattr("main.ocr_roi", True)
+    assert list(select_engines(["easyocr", "pytesseract"])) == ["pytesseract", "easyocr"]
+    with pytest.raises(ValueError, match="easyocr"):
+        select_engines(["pytesseract"])
@@ -0,0 +1,48 @@
+#!/usr/bin/env python
+
+import json
+import pytest
+import sys
+from pathlib import Path
+
+# Add parent directory to path so we can import utils.metrics
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.metrics import Registry
+
+
+def test_timer_records_stage_histogram():
+    """Test that timed stages are exported as Prometheus histograms, even when they raise."""
+    registry = Registry(prefix="test")
+
+    with registry.timer("decode"):
+        pass
+    with pytest.raises(RuntimeError):
+        with registry.timer("fetch", backend="httpx"):
+            raise RuntimeError("boom")
+    registry.inc("requests_total", status="429")
+
+    text = registry.prometheus_text()
+    assert "# TYPE test_stage_seconds histogram" in text
+    assert 'test_stage_seconds_count{stage="decode"} 1' in text
+    assert 'test_stage_seconds_bucket{backend="httpx",stage="fetch",le="+Inf"} 1' in text
+    assert 'test_requests_total{status="429"} 1' in text
+    assert registry.snapshot()["histograms"]["stage_seconds{stage=decode}"]["count"] == 1
+
+
+def test_events_are_logged_as_json_lines(tmp_path):
+    """Test that each event is appended to the log as one JSON object."""
+    log_path = tmp_path / "metrics.jsonl"
+    registry = Registry(str(log_path))
+
+    with registry.timer("regex"):
+        pass
+    registry.inc("usernames_found_total", 3)
+    registry.log.close()
+
+    events = [json.loads(line) for line in log_path.read_text().splitlines()]
+    assert [(event["name"], event.get("stage")) for event in events] == [
+        ("stage_seconds", "regex"),
+        ("usernames_found_total", None),
+    ]
+    assert events[1]["value"] == 3
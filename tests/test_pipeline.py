@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+
+import csv
+import pytest
+import sqlite3
+import sys
+import threading
+from pathlib import Path
+
+# Add parent directory to path so we can import pipeline
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from pipeline import run_pipeline
+from utils.channel_finder import ChannelResult, FirecrawlYouTubeScraper
+
+
+@pytest.fixture
+def scraper(monkeypatch, tmp_path):
+    """Scraper for a CSV that doesn't exist yet, with a dummy API key and no rate limit."""
+    monkeypatch.setenv("FIRECRAWL_API_KEY", "test-key")
+    monkeypatch.setenv("CHANNEL_CACHE_PATH", str(tmp_path / "channels.sqlite3"))
+    return FirecrawlYouTubeScraper(str(tmp_path / "usernames.csv"), concurrency=2, rate=0)
+
+
+def test_pipeline_resolves_while_ocr_runs(monkeypatch, scraper):
+    """Test that usernames are resolved before OCR finishes, once each, and written to the CSV."""
+    resolved = threading.Event()
+    overlapped = []
+    images = [["@first", "@second"], ["@First", "@third"], []]
+
+    def fake_process_images(image_paths, *args):
+        for image, usernames in zip(image_paths, images):
+            yield {"image": image, "usernames": usernames}
+            if image == "one.png":
+                # The first username should reach a resolver while OCR is still running
+                overlapped.append(resolved.wait(1))
+
+    def fake_scrape_channel_id(username):
+        resolved.set()
+        return ChannelResult(username, "UC" + username[1:].ljust(22, "x"), "", "found")
+
+    monkeypatch.setattr("main.process_images", fake_process_images)
+    scraper.scrape_channel_id = fake_scrape_channel_id
+
+    results = list(run_pipeline(["one.png", "two.png", "three.png"], scraper, scraper.csv_file, queue_size=1))
+
+    assert overlapped == [True]
+    assert sorted(result.username for result in results) == ["@first", "@second", "@third"]
+    with open(scraper.csv_file, encoding="utf-8") as f:
+        assert [row["username"] for row in csv.DictReader(f)] == ["@first", "@second", "@third"]
+
+
+def test_pipeline_survives_failures(monkeypatch, scraper):
+    """Test that a lookup that raises becomes an error result and an OCR failure reaches the caller."""
+    def fake_process_images(image_paths, *args):
+        yield {"image": "one.png", "usernames": ["@good", "@bad", "@late"]}
+        raise ValueError("Unknown OCR engine: nope")
+
+    def fake_scrape_channel_id(username):
+        if username == "@bad":
+            raise sqlite3.OperationalError("database is locked")
+        return ChannelResult(username, "UC" + username[1:].ljust(22, "x"), "", "found")
+
+    monkeypatch.setattr("main.process_images", fake_process_images)
+    scraper.scrape_channel_id = fake_scrape_channel_id
+
+    results = []
+    with pytest.raises(ValueError, match="Unknown OCR engine"):
+        for result in run_pipeline(["one.png"], scraper, scraper.csv_file, queue_size=1):
+            results.append(result)
+
+    assert {result.username: result.status for result in results} == {
+        "@good": "found", "@bad": "error", "@late": "found",
+    }
+    assert next(result for result in results if result.username == "@bad").error_msg == "database is locked"
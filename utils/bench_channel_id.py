@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+
+import argparse
+import re
+import sys
+import timeit
+from pathlib import Path
+from typing import Optional
+
+from channel_finder import extract_channel_id, extract_channel_id_from_chunks
+
+
+"""
+Micro-benchmark for channel ID extraction on saved YouTube pages
+
+Compares the substring scans in channel_finder.py, one str.find per marker
+in priority order, with the previous one-regex-per-pattern approach, and
+shows how much of a streamed body is read before the scan can stop. Pages
+with a canonical link in their <head> stop there.
+
+Usage:
+    python bench_channel_id.py                      # bundled fixtures
+    python bench_channel_id.py saved/*.html --pad-kb 2048
+"""
+
+
+FIXTURES_DIR = Path(__file__).parent.parent / "tests" / "fixtures" / "youtube"
+
+# Markup inserted ahead of the page content to mimic multi-megabyte pages
+FILLER = '<div class="style-scope ytd-rich-grid-row"><a href="/watch?v=xxxxxxxxxxx">Video</a></div>\n'
+
+
+def legacy_extract_channel_id(content: str) -> Optional[str]:
+    """The previous implementation: up to five regex searches over the page"""
+    patterns = [
+        r'"externalId":"(UC[a-zA-Z0-9_-]{22})"',
+        r'"channelId":"(UC[a-zA-Z0-9_-]{22})"',
+        r"/channel/(UC[a-zA-Z0-9_-]{22})",
+        r'"browse_id":"(UC[a-zA-Z0-9_-]{22})"',
+        r'"browseEndpoint":{"browseId":"(UC[a-zA-Z0-9_-]{22})"',
+    ]
+
+    for pattern in patterns:
+        match = re.search(pattern, content)
+        if match:
+            return match.group(1)
+
+    return None
+
+
+def chunked(content: str, size: int):
+    """Yield content in chunks, recording how many characters were handed out"""
+    chunked.consumed = 0
+    for start in range(0, len(content), size):
+        chunk = content[start:start + size]
+        chunked.consumed += len(chunk)
+        yield chunk
+
+
+def time_per_call(func, content: str) -> float:
+    """Best-of-five seconds per call"""
+    timer = timeit.Timer(lambda: func(content))
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=5, number=number)) / number
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark channel ID extraction")
+    parser.add_argument("files", nargs="*", help="Saved YouTube HTML pages (default: bundled fixtures)")
+    parser.add_argument(
+        "--pad-kb", type=int, default=2048, help="Filler prepended to each page, in KiB (default: 2048)"
+    )
+    parser.add_argument(
+        "--chunk-kb", type=int, default=64, help="Chunk size for the streaming scan, in KiB (default: 64)"
+    )
+    args = parser.parse_args()
+
+    files = [Path(f) for f in args.files] or sorted(FIXTURES_DIR.glob("*.html"))
+    if not files:
+        print("❌ No HTML fixtures found")
+        sys.exit(1)
+
+    padding = FILLER * (args.pad_kb * 1024 // len(FILLER))
+    print(f"{'Page':<32} {'Size':>9} {'Legacy':>10} {'Scan':>10} {'Speedup':>8} {'Streamed':>9}")
+    print("-" * 83)
+
+    for path in files:
+        html = path.read_text(encoding="utf-8", errors="replace")
+        body_start = html.find("<body>") + len("<body>") if "<body>" in html else 0
+        content = html[:body_start] + padding + html[body_start:]
+
+        expected = legacy_extract_channel_id(content)
+        if extract_channel_id(content) != expected:
+            print(f"❌ {path.name}: scan disagrees with legacy extraction")
+            sys.exit(1)
+        if extract_channel_id_from_chunks(chunked(content, args.chunk_kb * 1024)) != expected:
+            print(f"❌ {path.name}: streaming scan disagrees with legacy extraction")
+            sys.exit(1)
+        streamed = chunked.consumed / len(content)
+
+        legacy = time_per_call(legacy_extract_channel_id, content)
+        scan = time_per_call(extract_channel_id, content)
+        print(
+            f"{path.name[:32]:<32} {len(content) / 1024:>7.0f}KB {legacy * 1000:>8.2f}ms "
+            f"{scan * 1000:>8.2f}ms {legacy / scan:>7.1f}x {streamed:>8.0%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+
+import argparse
+import json
+import platform
+import random
+import resource
+import string
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+
+"""
+Benchmark OCR engines on a reproducible synthetic screenshot corpus
+
+Renders screenshots of handles mixed with email addresses and filler text,
+in light and dark mode at several resolutions, with noise. Each engine then
+runs in its own process over the corpus through main.process_images, and
+the harness reports images/sec, p50/p95 per-image latency, peak RSS and the
+precision/recall of the usernames found against the rendered handles.
+
+Engine settings are read from the environment as usual, so configurations
+can be compared by running the benchmark with different variables set, e.g.
+TESSERACT_PROFILE=handles python bench_ocr.py --engine pytesseract
+
+Usage:
+    python bench_ocr.py                            # 40 images, every engine
+    python bench_ocr.py --images 200 --workers 8 --engine pytesseract
+"""
+
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+CORPUS_DIR = Path(__file__).parent.parent / ".bench_corpus"
+
+# Width in pixels of the rendered screenshots before scaling
+BASE_WIDTH = 900
+
+# Resolution multipliers, from small thumbnails to high-DPI captures
+SCALES = [0.5, 0.75, 1.0, 1.5, 2.0]
+
+FILLER_WORDS = [
+    "subscribe", "views", "ago", "watch", "later", "playlist", "shorts", "live",
+    "channel", "video", "comments", "share", "2.3K", "1 day", "#music", "v2.0",
+]
+
+EMAIL_DOMAINS = ["gmail.com", "yahoo.com", "outlook.com", "proton.me", "example.org"]
+
+
+def random_handle(rng: random.Random) -> str:
+    """A plausible YouTube handle, leading @ included"""
+    alphabet = string.ascii_letters + string.digits
+    name = rng.choice(string.ascii_letters) + "".join(rng.choice(alphabet) for _ in range(rng.randint(3, 14)))
+    if rng.random() < 0.3:
+        cut = rng.randint(2, len(name) - 1)
+        name = f"{name[:cut]}_{name[cut:]}"
+    return "@" + name
+
+
+def render_screenshot(rng: random.Random, font_size: int):
+    """Render one screenshot, returning the image and the handles drawn on it"""
+    from PIL import Image, ImageDraw, ImageFilter, ImageFont
+
+    dark = rng.random() < 0.4
+    background = (15, 15, 15) if dark else (255, 255, 255)
+    foreground = (241, 241, 241) if dark else (15, 15, 15)
+    muted = (170, 170, 170) if dark else (96, 96, 96)
+
+    try:
+        font = ImageFont.load_default(size=font_size)
+    except TypeError:
+        # Pillow without FreeType only has the fixed-size bitmap font
+        font = ImageFont.load_default()
+
+    lines, handles = [], []
+    for _ in range(rng.randint(4, 9)):
+        kind = rng.random()
+        if kind < 0.45:
+            handle = random_handle(rng)
+            handles.append(handle)
+            lines.append((f"{handle} - {rng.randint(1, 999)}K subscribers", foreground))
+        elif kind < 0.6:
+            user = random_handle(rng)[1:].lower()
+            lines.append((f"contact: {user}@{rng.choice(EMAIL_DOMAINS)}", muted))
+        else:
+            lines.append((" ".join(rng.choice(FILLER_WORDS) for _ in range(rng.randint(3, 8))), muted))
+
+    line_height = int(font_size * 1.8)
+    image = Image.new("RGB", (BASE_WIDTH, line_height * (len(lines) + 2)), background)
+    draw = ImageDraw.Draw(image)
+    for row, (text, color) in enumerate(lines, 1):
+        draw.text((rng.randint(16, 64), row * line_height), text, fill=color, font=font)
+
+    # Sensor-like noise and a little blur, as in scaled or compressed captures
+    noise = Image.effect_noise(image.size, rng.uniform(4, 24)).convert("RGB")
+    image = Image.blend(image, noise, rng.uniform(0.02, 0.08))
+    if rng.random() < 0.5:
+        image = image.filter(ImageFilter.GaussianBlur(rng.uniform(0.3, 0.9)))
+
+    scale = rng.choice(SCALES)
+    image = image.resize((int(image.width * scale), int(image.height * scale)), Image.Resampling.LANCZOS)
+    return image, handles
+
+
+def generate_corpus(corpus_dir: Path, count: int, seed: int) -> dict:
+    """Write count screenshots and a manifest of their expected handles, reusing a matching corpus"""
+    manifest_file = corpus_dir / "manifest.json"
+    if manifest_file.exists():
+        manifest = json.loads(manifest_file.read_text(encoding="utf-8"))
+        if manifest["seed"] == seed and len(manifest["images"]) == count:
+            return manifest
+
+    corpus_dir.mkdir(parents=True, exist_ok=True)
+    for stale in corpus_dir.glob("*.png"):
+        stale.unlink()
+
+    rng = random.Random(seed)
+    images = {}
+    for index in range(count):
+        image, handles = render_screenshot(rng, rng.choice([14, 16, 20, 24]))
+        path = corpus_dir / f"screenshot_{index:04d}.png"
+        image.save(path)
+        images[str(path)] = handles
+
+    manifest = {"seed": seed, "images": images}
+    manifest_file.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    return manifest
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    return peak / (1024 * 1024) if platform.system() == "Darwin" else peak / 1024
+
+
+def run_engine(engine: str, image_paths: list, workers: int) -> dict:
+    """Run one engine over the corpus in this process, with the OCR cache off"""
+    import main as ocr
+
+    ocr.ocr_cache_enabled = False
+
+    start = time.perf_counter()
+    if ocr.uses_easyocr([engine]):
+        ocr.load_easyocr()
+    load_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    latencies, found = [], {}
+    for result in ocr.process_images(image_paths, workers, False, 1, [engine]):
+        latencies.append(result["timings"].get(engine, 0.0))
+        found[result["image"]] = result.get(engine, [])
+    elapsed = time.perf_counter() - start
+
+    return {
+        "engine": engine,
+        "load": load_time,
+        "elapsed": elapsed,
+        "latencies": latencies,
+        "found": found,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def percentile(values: list, fraction: float) -> float:
+    """Nearest-rank percentile"""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))] if ordered else 0.0
+
+
+def score(expected: dict, found: dict) -> tuple:
+    """Micro-averaged precision and recall of found handles, ignoring case"""
+    true_positives = predicted = relevant = 0
+    for image, handles in expected.items():
+        wanted = {handle.lower() for handle in handles}
+        got = {username.lower() for username in found.get(image, [])}
+        true_positives += len(wanted & got)
+        predicted += len(got)
+        relevant += len(wanted)
+    precision = true_positives / predicted if predicted else 0.0
+    recall = true_positives / relevant if relevant else 0.0
+    return precision, recall
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark OCR engines on synthetic screenshots")
+    parser.add_argument("-e", "--engine", action="append", dest="engines", help="Engine to run, repeat for several")
+    parser.add_argument("-n", "--images", type=int, default=40, help="Screenshots in the corpus (default: 40)")
+    parser.add_argument("-w", "--workers", type=int, default=1, help="Images processed concurrently (default: 1)")
+    parser.add_argument("--seed", type=int, default=1234, help="Corpus random seed (default: 1234)")
+    parser.add_argument("--corpus", default=str(CORPUS_DIR), help=f"Corpus directory (default: {CORPUS_DIR})")
+    parser.add_argument("--run-engine", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    corpus_dir = Path(args.corpus)
+    manifest = generate_corpus(corpus_dir, args.images, args.seed)
+    image_paths = list(manifest["images"])
+
+    if args.run_engine:
+        # Child process: print the raw measurements for the parent
+        print(json.dumps(run_engine(args.run_engine, image_paths, args.workers)))
+        return
+
+    import main as ocr
+
+    engines = args.engines or list(ocr.OCR_ENGINES)
+    print(f"Corpus: {len(image_paths)} images in {corpus_dir} (seed {args.seed}), {args.workers} worker(s)\n")
+    print(f"{'Engine':<12} {'Load':>7} {'Img/s':>7} {'p50':>8} {'p95':>8} {'Peak RSS':>9} {'Prec':>6} {'Recall':>7}")
+    print("-" * 72)
+
+    for engine in engines:
+        # A fresh process per engine keeps model memory and warm caches separate
+        command = [
+            sys.executable, __file__, "--run-engine", engine, "--images", str(args.images),
+            "--seed", str(args.seed), "--corpus", str(corpus_dir), "--workers", str(args.workers),
+        ]
+        completed = subprocess.run(command, capture_output=True, text=True)
+        lines = completed.stdout.strip().splitlines()
+        if completed.returncode != 0 or not lines:
+            print(f"{engine:<12} failed: {completed.stderr.strip().splitlines()[-1:] or ['no output']}")
+            continue
+
+        run = json.loads(lines[-1])
+        precision, recall = score(manifest["images"], run["found"])
+        latencies = run["latencies"]
+        print(
+            f"{engine:<12} {run['load']:>6.1f}s {len(latencies) / run['elapsed']:>7.1f} "
+            f"{percentile(latencies, 0.5) * 1000:>6.0f}ms {percentile(latencies, 0.95) * 1000:>6.0f}ms "
+            f"{run['peak_rss_mb']:>7.0f}MB {precision:>6.1%} {recall:>7.1%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
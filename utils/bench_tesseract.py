@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+
+import argparse
+import io
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from bench_ocr import render_screenshot
+
+
+"""
+Per-image overhead of the pytesseract subprocess versus tesserocr's in-process API
+
+Renders a few synthetic screenshots, from a single handle line up to a full
+page, and times tesseract over each with both backends. Small images show
+the fixed cost of spawning tesseract and writing a temporary file per call.
+
+Usage:
+    python bench_tesseract.py
+    python bench_tesseract.py --repeat 50
+"""
+
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# Height of each benchmark image in text lines, from one handle to a full page
+SIZES = {"line": 1, "card": 3, "page": 9}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare tesseract backends' per-image overhead")
+    parser.add_argument("-n", "--repeat", type=int, default=20, help="Calls per image and backend (default: 20)")
+    parser.add_argument("--seed", type=int, default=1234, help="Image random seed (default: 1234)")
+    args = parser.parse_args()
+
+    import main as ocr
+
+    ocr.ocr_cache_enabled = False
+
+    rng = random.Random(args.seed)
+    images = {}
+    for name, lines in SIZES.items():
+        image, _ = render_screenshot(rng, 20)
+        images[name] = image.crop((0, 0, image.width, min(image.height, int(20 * 1.8 * (lines + 1)))))
+
+    backends = ["pytesseract"]
+    ocr.tesseract_backend = "tesserocr"
+    if ocr.get_tesseract_backend() == "tesserocr":
+        backends.append("tesserocr")
+    else:
+        print("⚠️  tesserocr not installed, timing pytesseract only\n")
+
+    print(f"{'Image':<8} {'Size':>10} " + " ".join(f"{backend:>12}" for backend in backends) + f" {'Saved':>10}")
+    print("-" * (32 + 13 * len(backends)))
+
+    for name, image in images.items():
+        buffer = io.BytesIO()
+        image.save(buffer, format="PNG")
+        decoded = ocr.DecodedImage(buffer.getvalue(), source=name)
+
+        medians = []
+        for backend in backends:
+            ocr.tesseract_backend = backend
+            ocr.extract_usernames_pytesseract(decoded)  # warm up
+            timings = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                ocr.extract_usernames_pytesseract(decoded)
+                timings.append(time.perf_counter() - start)
+            medians.append(statistics.median(timings))
+
+        saved = f"{(medians[0] - medians[-1]) * 1000:>8.1f}ms" if len(medians) > 1 else f"{'-':>10}"
+        print(
+            f"{name:<8} {image.width:>4}x{image.height:<5} "
+            + " ".join(f"{median * 1000:>10.1f}ms" for median in medians)
+            + f" {saved}"
+        )
+
+
+if __name__ == "__main__":
+    main()
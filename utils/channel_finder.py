@@ -5,24 +5,53 @@ import os
 import sys
 import argparse
 import time
+import itertools
 import json
+import random
 import re
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from collections import Counter
+from collections.abc import MutableMapping
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass, asdict
-from decouple import config
-from firecrawl import FirecrawlApp
-from typing import Dict, List, Optional, Tuple
+from decouple import Csv, config
+from email.utils import parsedate_to_datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
 
 """
 YouTube Channel ID Scraper using Firecrawl
-Automatically finds YouTube channel IDs using Firecrawl for reliable scraping
+Automatically finds YouTube channel IDs using Firecrawl for reliable scraping,
+or by fetching pages directly with httpx
 
 Configuration via .env file:
     FIRECRAWL_API_KEY=your_api_key_here
     FIRECRAWL_DELAY=1.0  # Optional delay between requests
+    FIRECRAWL_RATE=1.0  # Optional requests per second, overrides FIRECRAWL_DELAY
+    FIRECRAWL_BURST=1  # Optional requests allowed back to back
+    FIRECRAWL_CONCURRENCY=4  # Optional usernames resolved at once
+    FIRECRAWL_HEDGE=2  # Optional URL variants raced per username
+    CHANNEL_CACHE=true  # Optional, reuse results across runs
+    CHANNEL_CACHE_PATH=.channel_cache.sqlite3  # Optional cache location
+    CHANNEL_CACHE_NOT_FOUND_DAYS=7  # Optional days before retrying a not_found username
+    FIRECRAWL_FETCH_STRATEGIES=metadata,html  # Optional payloads to request, lightest first
+    FETCH_BACKEND=firecrawl  # Optional, or httpx to fetch pages directly
+    FETCH_BASE_URL=http://127.0.0.1:8766  # Optional, send httpx requests to the fixture server
+    FETCH_MAX_CONNECTIONS=10  # Optional pooled connections for the httpx backend
+    FETCH_MAX_PER_HOST=6  # Optional requests in flight per host for the httpx backend
+    FETCH_HTTP2=true  # Optional, use HTTP/2 when h2 is installed
+    FETCH_RETRIES=3  # Optional retries after a rate limit, server or network error
+    FETCH_BACKOFF=0.5  # Optional first backoff in seconds, doubled on each retry
+    FETCH_BACKOFF_MAX=30  # Optional cap on a single backoff
+    CIRCUIT_THRESHOLD=5  # Optional provider failures in a row that pause all requests
+    CIRCUIT_COOLDOWN=30  # Optional seconds requests are paused for
+    METRICS_PORT=9108  # Optional, serve per-stage timings for Prometheus (see metrics.py)
 
 Usage:
     python channel_finder.py ../extracted_usernames.csv
+    python channel_finder.py users.csv --backend httpx --base-url http://127.0.0.1:8766 --no-cache
 """
 
 
@@ -42,6 +71,26 @@ try:
 except ImportError:
     RICH_AVAILABLE = False
 
+try:
+    import httpx
+
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+try:
+    import h2  # noqa: F401
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+try:
+    from utils import metrics
+except ImportError:
+    # Run as a script from utils/
+    import metrics
+
 
 @dataclass
 class ChannelResult:
@@ -52,15 +101,698 @@ class ChannelResult:
     error_msg: str = ""
 
 
+# Start of a Glance videos widget, followed by one glance_entry() per channel
+GLANCE_HEADER = "- type: videos\n  channels:\n"
+
+# Journal entries allowed before compaction, regardless of how few channels there are
+JOURNAL_COMPACT_MIN = 1000
+
+# Backends that can fetch channel pages, see Fetcher
+FETCH_BACKENDS = ["firecrawl", "httpx"]
+
+YOUTUBE_ORIGIN = "https://www.youtube.com"
+
+# Sent by direct fetchers so YouTube serves the regular English desktop page
+HTTP_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/126.0 Safari/537.36",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+
+# Answer YouTube's cookie consent prompt (rejecting all) so EU requests get the page itself
+CONSENT_COOKIES = {"SOCS": "CAI", "CONSENT": "YES+cb"}
+
+# Text of the consent interstitial, for when it's served in place of the page rather than redirected to
+CONSENT_PAGE_MARKERS = ("<title>Before you continue to YouTube</title>", 'action="https://consent.youtube.com/')
+
+# Characters at the start of a body checked for CONSENT_PAGE_MARKERS
+CONSENT_PAGE_SCAN = 64 * 1024
+
+# URL templates tried for each username, in default priority order.
+# /about endpoints come first as they're more reliable and consistently successful.
+URL_TEMPLATES = [
+    "https://www.youtube.com/{handle}/about",
+    "https://www.youtube.com/c/{name}/about",
+    "https://www.youtube.com/user/{name}/about",
+    "https://www.youtube.com/{handle}",
+    "https://www.youtube.com/c/{name}",
+    "https://www.youtube.com/user/{name}",
+]
+
+# The identities URL templates look a username up by, most authoritative
+# first. Legacy /c/ and /user/ names can belong to a different channel than
+# the @handle, so their hits only count once every @handle URL has missed.
+CHANNEL_IDENTITIES = [
+    "https://www.youtube.com/{handle}",
+    "https://www.youtube.com/c/{name}",
+    "https://www.youtube.com/user/{name}",
+]
+
+
+def template_identity(template: str) -> int:
+    """Rank of the identity a URL template looks up, see CHANNEL_IDENTITIES"""
+    return next(rank for rank, prefix in enumerate(CHANNEL_IDENTITIES) if template.startswith(prefix))
+
+
+# The page's own URL, most reliable of all. Only searched for in the <head>,
+# so pages without them never pay for a scan of the whole body
+HEAD_CHANNEL_ID_MARKERS = [
+    ('<link rel="canonical" href="https://www.youtube.com/channel/', re.compile(r"(UC[a-zA-Z0-9_-]{22})")),
+    ('<meta property="og:url" content="https://www.youtube.com/channel/', re.compile(r"(UC[a-zA-Z0-9_-]{22})")),
+]
+
+# Text that precedes a channel ID anywhere in YouTube pages, most reliable
+# first, each with a precompiled pattern anchored at the end of the marker
+CHANNEL_ID_MARKERS = [
+    ('"externalId":"', re.compile(r'(UC[a-zA-Z0-9_-]{22})"')),
+    ('"channelId":"', re.compile(r'(UC[a-zA-Z0-9_-]{22})"')),
+    ("/channel/", re.compile(r"(UC[a-zA-Z0-9_-]{22})")),
+    ('"browse_id":"', re.compile(r'(UC[a-zA-Z0-9_-]{22})"')),
+    ('"browseEndpoint":{"browseId":"', re.compile(r"(UC[a-zA-Z0-9_-]{22})")),
+]
+
+# Firecrawl scrape options for each fetch strategy. "metadata" asks for an
+# almost empty markdown body and reads the page's own og:url/canonical link from
+# the metadata, "rawHtml" skips Firecrawl's HTML cleanup and "html" is the full
+# cleaned page.
+FETCH_STRATEGIES = {
+    "metadata": {"formats": ["markdown"], "only_main_content": True, "include_tags": ["title"]},
+    "rawHtml": {"formats": ["rawHtml"]},
+    "html": {"formats": ["html"]},
+}
+
+# Metadata keys that hold the URL of the page itself rather than the one requested
+CANONICAL_METADATA_KEYS = ["ogUrl", "og:url", "canonical"]
+
+CANONICAL_CHANNEL_PATTERN = re.compile(r"youtube\.com/channel/(UC[a-zA-Z0-9_-]{22})")
+
+# Characters kept between streamed chunks so a marker split across them is still found
+CHANNEL_ID_OVERLAP = max(len(marker) for marker, _ in CHANNEL_ID_MARKERS) + 25
+
+
+def find_marked_channel_id(
+    content: str, marker: str, pattern: re.Pattern, end: Optional[int] = None
+) -> Optional[str]:
+    """Find the first channel ID following marker before end, using a substring scan"""
+    start = content.find(marker, 0, end)
+    while start >= 0:
+        match = pattern.match(content, start + len(marker))
+        if match:
+            return match.group(1)
+        start = content.find(marker, start + 1, end)
+    return None
+
+
+def find_head_channel_id(content: str, head_end: int) -> Optional[str]:
+    """Find the page's own channel ID in its <head>, which ends at head_end"""
+    for marker, pattern in HEAD_CHANNEL_ID_MARKERS:
+        channel_id = find_marked_channel_id(content, marker, pattern, head_end)
+        if channel_id:
+            return channel_id
+    return None
+
+
+def extract_channel_id(content: str) -> Optional[str]:
+    """
+    Extract the most reliable channel ID from page content.
+
+    Each marker is located with its own str.find, in priority order until
+    one matches, and the ID is matched only at that position. A find per
+    marker is much cheaper than a regex over the whole page, including one
+    regex alternating between every marker. The page's canonical URL is
+    only looked for in the <head>.
+    """
+    head_end = content.find("</head>")
+    if head_end >= 0:
+        channel_id = find_head_channel_id(content, head_end)
+        if channel_id:
+            return channel_id
+
+    for marker, pattern in CHANNEL_ID_MARKERS:
+        channel_id = find_marked_channel_id(content, marker, pattern)
+        if channel_id:
+            return channel_id
+    return None
+
+
+def extract_channel_id_from_metadata(metadata: Optional[Dict]) -> Optional[str]:
+    """Extract the channel ID from a page's canonical URL in scrape metadata"""
+    for key in CANONICAL_METADATA_KEYS:
+        values = (metadata or {}).get(key) or []
+        for value in values if isinstance(values, list) else [values]:
+            match = CANONICAL_CHANNEL_PATTERN.search(str(value))
+            if match:
+                return match.group(1)
+    return None
+
+
+def extract_channel_id_from_chunks(chunks: Iterable[str]) -> Optional[str]:
+    """
+    Extract the most reliable channel ID from a streamed body.
+
+    The <head> is read in full first, and a canonical URL there ends the scan
+    before the body is read. Otherwise scanning stops at the first
+    externalId, or returns the best match across every chunk, exactly as
+    extract_channel_id() would on the whole body.
+    """
+    chunks = iter(chunks)
+    head = ""
+    head_end = -1
+    for chunk in chunks:
+        head += chunk
+        head_end = head.find("</head>", max(0, len(head) - len(chunk) - len("</head>")))
+        if head_end >= 0:
+            break
+    if head_end >= 0:
+        channel_id = find_head_channel_id(head, head_end)
+        if channel_id:
+            return channel_id
+
+    best, best_priority = None, len(CHANNEL_ID_MARKERS)
+    tail = ""
+    for chunk in itertools.chain([head], chunks):
+        window = tail + chunk
+        for priority, (marker, pattern) in enumerate(CHANNEL_ID_MARKERS[:best_priority]):
+            channel_id = find_marked_channel_id(window, marker, pattern)
+            if channel_id:
+                best, best_priority = channel_id, priority
+                break
+        if best_priority == 0:
+            return best
+        tail = window[-CHANNEL_ID_OVERLAP:]
+    return best
+
+
+def check_consent_page(chunks: Iterable[str], status: int) -> Iterator[str]:
+    """Pass a streamed body through, raising FetchError if it starts like the consent interstitial"""
+    start = ""
+    for chunk in chunks:
+        if start is not None:
+            start += chunk
+            if any(marker in start for marker in CONSENT_PAGE_MARKERS):
+                raise FetchError("Served the cookie consent page", status=status)
+            if len(start) >= CONSENT_PAGE_SCAN:
+                start = None
+        yield chunk
+
+
+class ChannelTable(MutableMapping):
+    """
+    Channel results by username, with status counts kept up to date.
+
+    Counts and the index of usernames still to scrape are updated as results
+    are stored, so stats are O(1) and listing pending usernames only touches
+    pending entries. To change a status, store a new result rather than
+    editing a stored one in place.
+    """
+
+    # Statuses that still need scraping; errors are retried on the next run
+    PENDING_STATUSES = ("pending", "error")
+
+    def __init__(self):
+        self.results: Dict[str, ChannelResult] = {}
+        self.counts: Counter = Counter()
+        # Insertion-ordered set of usernames with a pending status
+        self.pending: Dict[str, None] = {}
+        self.lock = threading.Lock()
+
+    def __getitem__(self, username: str) -> ChannelResult:
+        return self.results[username]
+
+    def __setitem__(self, username: str, result: ChannelResult):
+        with self.lock:
+            previous = self.results.get(username)
+            if previous is not None:
+                self.counts[previous.status] -= 1
+            self.results[username] = result
+            self.counts[result.status] += 1
+            if result.status in self.PENDING_STATUSES:
+                self.pending[username] = None
+            else:
+                self.pending.pop(username, None)
+
+    def __delitem__(self, username: str):
+        with self.lock:
+            result = self.results.pop(username)
+            self.counts[result.status] -= 1
+            self.pending.pop(username, None)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.results)
+
+    def __len__(self) -> int:
+        return len(self.results)
+
+    def count(self, status: str) -> int:
+        """Number of results with status"""
+        return self.counts[status]
+
+    def pending_usernames(self) -> List[str]:
+        """Usernames that still need scraping, in the order they became pending"""
+        with self.lock:
+            return list(self.pending)
+
+
+class TokenBucket:
+    """Thread-safe token bucket allowing `rate` requests per second in bursts of up to `capacity`"""
+
+    def __init__(self, rate: float, capacity: int = 1):
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Take a token, blocking until one is available. Returns the seconds waited"""
+        if self.rate <= 0:
+            return 0.0
+
+        waited = 0.0
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+            waited += wait
+
+
+class ChannelCache:
+    """
+    Local SQLite store of resolved usernames, shared across CSV runs.
+
+    Found channels are kept indefinitely. not_found results expire after
+    not_found_ttl seconds so handles created later get another look. Errors
+    are never stored, and usernames are matched case-insensitively like
+    YouTube handles.
+    """
+
+    def __init__(self, path: str, not_found_ttl: float):
+        self.path = path
+        self.not_found_ttl = not_found_ttl
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS channels ("
+            "username TEXT PRIMARY KEY, channel_id TEXT NOT NULL, url TEXT NOT NULL, "
+            "status TEXT NOT NULL, updated REAL NOT NULL)"
+        )
+        self.conn.commit()
+
+    def get(self, username: str) -> Optional[ChannelResult]:
+        """Return the stored result for a username, or None if unknown or expired"""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT channel_id, url, status, updated FROM channels WHERE username = ?",
+                (username.lower(),),
+            ).fetchone()
+        if row is None:
+            return None
+
+        channel_id, url, status, updated = row
+        if status == "not_found" and time.time() - updated > self.not_found_ttl:
+            return None
+        error_msg = "Channel not found with any URL format (cached)" if status == "not_found" else ""
+        return ChannelResult(
+            username=username, channel_id=channel_id, url=url, status=status, error_msg=error_msg
+        )
+
+    def set(self, result: ChannelResult):
+        """Store a found or not_found result"""
+        if result.status not in ("found", "not_found"):
+            return
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO channels (username, channel_id, url, status, updated) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (result.username.lower(), result.channel_id, result.url, result.status, time.time()),
+            )
+            self.conn.commit()
+
+
+def glance_entry(result: ChannelResult) -> str:
+    """A found channel as a line of the Glance videos widget's channel list"""
+    return f"    - {result.channel_id}  # {result.username}\n"
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header, given as seconds or an HTTP date"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class FetchError(Exception):
+    """A request that failed, with the HTTP status and Retry-After delay when there was a response"""
+
+    def __init__(self, message: str, status: Optional[int] = None, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+
+
+class RetryPolicy:
+    """
+    Decides whether and when a failed request is retried, by error class.
+
+    Rate limits (429) and server errors (5xx) back off exponentially with
+    full jitter, waiting for Retry-After instead when the server sent one,
+    up to max_delay. Network errors without a response back off the same
+    way. Other client errors are permanent and never retried.
+    """
+
+    def __init__(self, retries: int = 3, base_delay: float = 0.5, max_delay: float = 30.0):
+        self.retries = retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    @staticmethod
+    def is_transient(error: FetchError) -> bool:
+        """Whether error is the provider failing rather than the page"""
+        return error.status is None or error.status == 429 or error.status >= 500
+
+    def delay(self, error: FetchError, attempt: int) -> Optional[float]:
+        """Seconds to wait before retry number attempt + 1, or None to give up"""
+        if attempt >= self.retries or not self.is_transient(error):
+            return None
+        if error.retry_after is not None:
+            # Give up rather than stall a worker for as long as the server asks
+            return error.retry_after if error.retry_after <= self.max_delay else None
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+
+class CircuitBreaker:
+    """
+    Pauses every request after `threshold` provider failures in a row.
+
+    While open, callers wait out the cooldown instead of spending quota on a
+    provider that is down. A single probe request is then let through: success
+    closes the circuit, another failure opens it again.
+    """
+
+    def __init__(self, threshold: int = 5, cooldown: float = 30.0):
+        self.threshold = max(1, threshold)
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.probing = False
+        self.condition = threading.Condition()
+
+    def wait(self) -> float:
+        """Block while the circuit is open. Returns the seconds waited"""
+        start = time.monotonic()
+        with self.condition:
+            while self.opened_at is not None:
+                remaining = self.opened_at + self.cooldown - time.monotonic()
+                if remaining <= 0 and not self.probing:
+                    self.probing = True
+                    break
+                self.condition.wait(remaining if remaining > 0 else self.cooldown)
+        return time.monotonic() - start
+
+    def record_success(self):
+        """The provider answered, close the circuit"""
+        with self.condition:
+            self.failures = 0
+            self.opened_at = None
+            self.probing = False
+            self.condition.notify_all()
+
+    def record_failure(self) -> bool:
+        """The provider failed. Returns True if this opened the circuit"""
+        with self.condition:
+            self.failures += 1
+            if not self.probing and (self.opened_at is not None or self.failures < self.threshold):
+                return False
+            self.opened_at = time.monotonic()
+            self.probing = False
+            self.condition.notify_all()
+            return True
+
+
+class Fetcher(ABC):
+    """
+    Fetches a YouTube page and finds the channel ID in it.
+
+    fetch() returns the channel ID, or None when the page loaded without one
+    or doesn't exist, and raises FetchError when the request failed. Each
+    request waits on the shared rate limiter, and the requests, hits and
+    bytes received are counted per label in self.stats.
+    """
+
+    name = "fetcher"
+
+    def __init__(self, rate_limiter: Optional[TokenBucket] = None):
+        self.rate_limiter = rate_limiter or TokenBucket(0)
+        self.stats: Dict[str, Dict[str, int]] = {}
+        self.stats_lock = threading.Lock()
+
+    @abstractmethod
+    def fetch(self, url: str) -> Optional[str]:
+        """The channel ID at url, or None for a missing page or one without an ID"""
+
+    def close(self):
+        """Release connections held by the backend"""
+
+    def throttle(self):
+        """Wait for this request's share of the rate limit"""
+        with metrics.timer("rate_limit_wait"):
+            self.rate_limiter.acquire()
+
+    def record(self, label: str, size: int, found: bool):
+        """Record the payload size and outcome of one request"""
+        with self.stats_lock:
+            stats = self.stats.setdefault(label, {"requests": 0, "hits": 0, "bytes": 0})
+            stats["requests"] += 1
+            stats["bytes"] += size
+            stats["hits"] += found
+
+
+class FirecrawlFetcher(Fetcher):
+    """Fetches pages through Firecrawl, trying the configured fetch strategies lightest first"""
+
+    name = "firecrawl"
+
+    def __init__(self, api_key: str, strategies: List[str], rate_limiter: Optional[TokenBucket] = None):
+        super().__init__(rate_limiter)
+        from firecrawl import FirecrawlApp
+
+        self.firecrawl = FirecrawlApp(api_key=api_key)
+        self.strategies = strategies
+
+    def fetch(self, url: str) -> Optional[str]:
+        """Fall back to the next strategy only when a page loads but no channel ID is found in it"""
+        for strategy in self.strategies:
+            self.throttle()
+            try:
+                with metrics.timer("firecrawl_round_trip", strategy=strategy):
+                    scrape_result = self.firecrawl.scrape_url(url, **FETCH_STRATEGIES[strategy])
+            except Exception as e:
+                response = getattr(e, "response", None)
+                raise FetchError(
+                    str(e) if str(e) != "None" else "HTTP Error",
+                    status=getattr(response, "status_code", None),
+                    retry_after=parse_retry_after(getattr(response, "headers", {}).get("Retry-After")),
+                ) from e
+
+            if not scrape_result:
+                raise FetchError(f"No result returned from {url}")
+
+            # A missing page won't have an ID in any format
+            metadata = getattr(scrape_result, "metadata", None) or {}
+            if metadata.get("statusCode") == 404:
+                self.record(strategy, 0, False)
+                return None
+
+            # Check if scraping was successful
+            if hasattr(scrape_result, "success") and not scrape_result.success:
+                raise FetchError(
+                    f"Scraping failed: {getattr(scrape_result, 'error', 'Unknown error')}",
+                    status=metadata.get("statusCode"),
+                )
+
+            if strategy == "metadata":
+                payload = json.dumps(metadata) + (getattr(scrape_result, "markdown", None) or "")
+                channel_id = extract_channel_id_from_metadata(metadata)
+            else:
+                payload = getattr(scrape_result, strategy, None) or ""
+                with metrics.timer("extract"):
+                    channel_id = extract_channel_id(payload) if payload else None
+
+            self.record(strategy, len(payload), bool(channel_id))
+            if channel_id:
+                return channel_id
+        return None
+
+
+class HttpxFetcher(Fetcher):
+    """
+    Fetches pages directly over a pooled, keep-alive httpx client.
+
+    Requests use HTTP/2 when h2 is installed, so concurrent fetches share one
+    multiplexed connection per host, and bodies are gzip (or brotli, when
+    installed) compressed. At most max_per_host requests are in flight to a
+    host. Consent cookies skip YouTube's cookie consent interstitial.
+
+    Bodies are streamed and scanning stops as soon as the page's own channel
+    ID is seen. With base_url set, www.youtube.com URLs are sent there
+    instead, e.g. to the local fixture server.
+    """
+
+    name = "httpx"
+
+    def __init__(
+        self,
+        max_connections: int = 10,
+        max_per_host: int = 6,
+        http2: bool = True,
+        timeout: float = 15.0,
+        base_url: Optional[str] = None,
+        rate_limiter: Optional[TokenBucket] = None,
+    ):
+        super().__init__(rate_limiter)
+        if not HTTPX_AVAILABLE:
+            raise RuntimeError("httpx is required for the httpx backend (uv sync --extra direct)")
+        self.base_url = base_url.rstrip("/") if base_url else None
+        self.max_per_host = max(1, max_per_host)
+        self.host_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self.host_slots_lock = threading.Lock()
+        # httpx advertises br itself when brotli is installed
+        self.client = httpx.Client(
+            headers=HTTP_HEADERS,
+            cookies=CONSENT_COOKIES,
+            http2=http2 and HTTP2_AVAILABLE,
+            timeout=timeout,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+        )
+
+    def host_slot(self, host: str) -> threading.BoundedSemaphore:
+        """The semaphore bounding concurrent requests to host"""
+        with self.host_slots_lock:
+            if host not in self.host_slots:
+                self.host_slots[host] = threading.BoundedSemaphore(self.max_per_host)
+            return self.host_slots[host]
+
+    def fetch(self, url: str) -> Optional[str]:
+        if self.base_url and url.startswith(YOUTUBE_ORIGIN):
+            url = self.base_url + url[len(YOUTUBE_ORIGIN):]
+
+        self.throttle()
+        try:
+            with self.host_slot(httpx.URL(url).host), self.client.stream("GET", url) as response:
+                if response.url.host.startswith("consent."):
+                    raise FetchError("Redirected to the cookie consent page", status=response.status_code)
+                # Other 4xx are YouTube refusing this page, a miss like a 404, not the backend failing
+                if 400 <= response.status_code < 500 and response.status_code != 429:
+                    channel_id = None
+                elif response.status_code >= 400:
+                    raise FetchError(
+                        f"HTTP {response.status_code}",
+                        status=response.status_code,
+                        retry_after=parse_retry_after(response.headers.get("Retry-After")),
+                    )
+                else:
+                    channel_id = extract_channel_id_from_chunks(check_consent_page(response.iter_text(), response.status_code))
+                size = response.num_bytes_downloaded
+        except httpx.HTTPError as e:
+            raise FetchError(str(e) or type(e).__name__) from e
+
+        self.record(self.name, size, bool(channel_id))
+        return channel_id
+
+    def close(self):
+        self.client.close()
+
+
 class FirecrawlYouTubeScraper:
-    def __init__(self, csv_file: str):
+    def __init__(
+        self,
+        csv_file: str,
+        concurrency: Optional[int] = None,
+        rate: Optional[float] = None,
+        use_cache: Optional[bool] = None,
+        backend: Optional[str] = None,
+        base_url: Optional[str] = None,
+    ):
         self.csv_file = csv_file
         self.api_key = config("FIRECRAWL_API_KEY", default=None)
         self.output_file = csv_file.replace(".csv", "_scraped.csv")
+        self.glance_file = self.output_file.replace(".csv", "_glance.yml")
+        self.journal_file = csv_file.replace(".csv", "_progress.jsonl")
+        self.journal = None
+        self.journal_entries = 0
         self.delay = config("FIRECRAWL_DELAY", default=1.0, cast=float)
-        self.channels: Dict[str, ChannelResult] = {}
+        default_rate = 1 / self.delay if self.delay > 0 else 0.0
+        self.rate = rate if rate is not None else config("FIRECRAWL_RATE", default=default_rate, cast=float)
+        self.concurrency = concurrency or config("FIRECRAWL_CONCURRENCY", default=4, cast=int)
+        self.rate_limiter = TokenBucket(self.rate, config("FIRECRAWL_BURST", default=1, cast=int))
+        self.hedge = config("FIRECRAWL_HEDGE", default=2, cast=int)
+        self.retry_policy = RetryPolicy(
+            config("FETCH_RETRIES", default=3, cast=int),
+            config("FETCH_BACKOFF", default=0.5, cast=float),
+            config("FETCH_BACKOFF_MAX", default=30.0, cast=float),
+        )
+        self.circuit = CircuitBreaker(
+            config("CIRCUIT_THRESHOLD", default=5, cast=int),
+            config("CIRCUIT_COOLDOWN", default=30.0, cast=float),
+        )
+        self.template_stats = {template: {"attempts": 0, "wins": 0} for template in URL_TEMPLATES}
+        self.fetch_strategies = config("FIRECRAWL_FETCH_STRATEGIES", default="metadata,html", cast=Csv())
+        self.backend = backend or config("FETCH_BACKEND", default="firecrawl")
+        self.base_url = base_url or config("FETCH_BASE_URL", default=None)
+        self.stats_lock = threading.Lock()
+        self.cache = None
+        if use_cache if use_cache is not None else config("CHANNEL_CACHE", default=True, cast=bool):
+            self.cache = ChannelCache(
+                config("CHANNEL_CACHE_PATH", default=".channel_cache.sqlite3"),
+                config("CHANNEL_CACHE_NOT_FOUND_DAYS", default=7.0, cast=float) * 86400,
+            )
+        self.channels = ChannelTable()
         self.console = Console() if RICH_AVAILABLE else None
 
+        self.fetcher = self.create_fetcher()
+
+    def create_fetcher(self) -> Fetcher:
+        """Create the configured fetch backend, exiting if it can't be used"""
+        if self.backend == "httpx":
+            try:
+                fetcher = HttpxFetcher(
+                    max_connections=config("FETCH_MAX_CONNECTIONS", default=10, cast=int),
+                    max_per_host=config("FETCH_MAX_PER_HOST", default=6, cast=int),
+                    http2=config("FETCH_HTTP2", default=True, cast=bool),
+                    base_url=self.base_url,
+                    rate_limiter=self.rate_limiter,
+                )
+            except RuntimeError as e:
+                self.print_error(str(e))
+                sys.exit(1)
+            self.print_info(f"✅ Fetching pages directly from {self.base_url or YOUTUBE_ORIGIN}")
+            return fetcher
+
+        if self.backend != "firecrawl":
+            self.print_error(f"Unknown fetch backend: {self.backend}")
+            self.print_info(f"Choose from: {', '.join(FETCH_BACKENDS)}")
+            sys.exit(1)
+
+        unknown = [name for name in self.fetch_strategies if name not in FETCH_STRATEGIES]
+        if unknown or not self.fetch_strategies:
+            self.print_error(f"Unknown fetch strategy: {', '.join(unknown) or '(none)'}")
+            self.print_info(f"Choose from: {', '.join(FETCH_STRATEGIES)}")
+            sys.exit(1)
+
         if not self.api_key:
             self.print_error("❌ Firecrawl API key required!")
             self.print_info(
@@ -71,8 +803,9 @@ class FirecrawlYouTubeScraper:
 
         # Initialize Firecrawl
         try:
-            self.firecrawl = FirecrawlApp(api_key=self.api_key)
+            fetcher = FirecrawlFetcher(self.api_key, self.fetch_strategies, rate_limiter=self.rate_limiter)
             self.print_info("✅ Firecrawl initialized successfully")
+            return fetcher
         except Exception as e:
             self.print_error(f"Failed to initialize Firecrawl: {e}")
             sys.exit(1)
@@ -111,7 +844,7 @@ class FirecrawlYouTubeScraper:
     def save_csv(self) -> bool:
         """Save results to CSV"""
         try:
-            with open(self.output_file, "w", encoding="utf-8", newline="") as file:
+            with metrics.timer("csv_write"), open(self.output_file, "w", encoding="utf-8", newline="") as file:
                 writer = csv.writer(file)
                 writer.writerow(["username", "url", "channel"])
 
@@ -122,134 +855,243 @@ class FirecrawlYouTubeScraper:
             self.print_error(f"Error saving CSV: {e}")
             return False
 
+    def record_progress(self, result: ChannelResult):
+        """Append a single result to the progress journal"""
+        try:
+            if self.journal is None:
+                self.journal = open(self.journal_file, "a", encoding="utf-8")
+            with metrics.timer("journal_write"):
+                self.journal.write(json.dumps(asdict(result)) + "\n")
+                self.journal.flush()
+            self.journal_entries += 1
+
+            # Compact once superseded entries outnumber the live ones
+            if self.journal_entries > max(JOURNAL_COMPACT_MIN, 2 * len(self.channels)):
+                self.save_progress()
+        except Exception as e:
+            self.print_error(f"Error recording progress: {e}")
+
     def save_progress(self, filename: str = None):
-        """Save progress to JSON file for resuming"""
-        progress_file = filename or self.csv_file.replace(".csv", "_progress.json")
+        """Compact progress into a journal with one line per resolved username"""
+        progress_file = filename or self.journal_file
         try:
-            with open(progress_file, "w", encoding="utf-8") as f:
-                json.dump({k: asdict(v) for k, v in self.channels.items()}, f, indent=2)
+            if progress_file == self.journal_file and self.journal is not None:
+                self.journal.close()
+                self.journal = None
+
+            # Write aside and swap in, so a crash never loses the old journal
+            temp_file = f"{progress_file}.tmp"
+            with open(temp_file, "w", encoding="utf-8") as f:
+                for channel in self.channels.values():
+                    if channel.status != "pending":
+                        f.write(json.dumps(asdict(channel)) + "\n")
+            os.replace(temp_file, progress_file)
+
+            if progress_file == self.journal_file:
+                self.journal_entries = 0
         except Exception as e:
             self.print_error(f"Error saving progress: {e}")
 
     def load_progress(self, filename: str = None) -> bool:
-        """Load progress from JSON file"""
-        progress_file = filename or self.csv_file.replace(".csv", "_progress.json")
+        """Load progress by replaying the journal, after any legacy JSON progress file"""
+        progress_file = filename or self.journal_file
+        legacy_file = self.csv_file.replace(".csv", "_progress.json")
+        loaded = False
         try:
-            if os.path.exists(progress_file):
-                with open(progress_file, "r", encoding="utf-8") as f:
+            if filename is None and os.path.exists(legacy_file):
+                with open(legacy_file, "r", encoding="utf-8") as f:
                     data = json.load(f)
                     for username, channel_data in data.items():
                         self.channels[username] = ChannelResult(**channel_data)
+                self.print_info(f"📂 Loaded progress from {legacy_file}")
+                loaded = True
+
+            if os.path.exists(progress_file):
+                entries = 0
+                with open(progress_file, "r", encoding="utf-8") as f:
+                    for line in f:
+                        try:
+                            channel_data = json.loads(line)
+                        except json.JSONDecodeError:
+                            # Torn final line from a crash mid-write
+                            continue
+                        self.channels[channel_data["username"]] = ChannelResult(**channel_data)
+                        entries += 1
+                if progress_file == self.journal_file:
+                    self.journal_entries = entries
                 self.print_info(f"📂 Loaded progress from {progress_file}")
-                return True
+                loaded = True
         except Exception as e:
             self.print_error(f"Error loading progress: {e}")
-        return False
+        return loaded
 
     def extract_channel_id_from_content(self, content: str) -> Optional[str]:
-        """Extract channel ID from Firecrawl content"""
-        # Try multiple patterns to find channel ID
-        patterns = [
-            r'"externalId":"(UC[a-zA-Z0-9_-]{22})"',
-            r'"channelId":"(UC[a-zA-Z0-9_-]{22})"',
-            r"/channel/(UC[a-zA-Z0-9_-]{22})",
-            r'"browse_id":"(UC[a-zA-Z0-9_-]{22})"',
-            r'"browseEndpoint":{"browseId":"(UC[a-zA-Z0-9_-]{22})"',
-        ]
-
-        for pattern in patterns:
-            match = re.search(pattern, content)
-            if match:
-                return match.group(1)
-
-        return None
+        """Extract channel ID from page content"""
+        return extract_channel_id(content)
 
-    def scrape_channel_id(self, username: str) -> ChannelResult:
+    def ordered_templates(self) -> List[str]:
         """
-        Scrape channel ID for a username using Firecrawl.
-        
-        Prioritizes /about endpoints as they're more reliable and consistently successful.
-        Falls back to base URLs if /about endpoints fail.
+        URL templates by identity, then by how often they have found a channel this run.
+
+        Win rates are smoothed so untried templates keep their default
+        position until there is evidence against them.
         """
-        result = ChannelResult(username=username)
+        with self.stats_lock:
+            return sorted(
+                URL_TEMPLATES,
+                key=lambda template: (
+                    template_identity(template),
+                    -(self.template_stats[template]["wins"] + 1) / (self.template_stats[template]["attempts"] + 2),
+                ),
+            )
 
-        # Try different URL formats, prioritizing /about endpoints as they're more reliable
-        urls_to_try = [
-            f"https://www.youtube.com/{username}/about",
-            f"https://www.youtube.com/c/{username.replace('@', '')}/about",
-            f"https://www.youtube.com/user/{username.replace('@', '')}/about",
-            f"https://www.youtube.com/{username}",
-            f"https://www.youtube.com/c/{username.replace('@', '')}",
-            f"https://www.youtube.com/user/{username.replace('@', '')}",
-        ]
+    @staticmethod
+    def settle(outcomes: Dict[str, Tuple[Optional[str], str]]) -> Tuple[bool, Optional[str]]:
+        """
+        Whether the templates tried so far settle the lookup, and the channel ID if found.
 
-        for url in urls_to_try:
+        A hit is taken from the most authoritative identity that hasn't
+        missed with every template. While that identity still has requests
+        outstanding the lookup waits, and if one of them failed it can't be
+        settled on a less authoritative identity's hit.
+        """
+        for identity in range(len(CHANNEL_IDENTITIES)):
+            templates = [template for template in URL_TEMPLATES if template_identity(template) == identity]
+            hits = [outcomes[template][0] for template in templates if outcomes.get(template, (None, ""))[0]]
+            if hits:
+                return True, hits[0]
+            if any(template not in outcomes for template in templates):
+                return False, None
+            if any(outcomes[template][1] for template in templates):
+                return True, None
+        return True, None
+
+    def record_attempt(self, template: str, won: bool):
+        """Record the outcome of trying a URL template"""
+        with self.stats_lock:
+            self.template_stats[template]["attempts"] += 1
+            if won:
+                self.template_stats[template]["wins"] += 1
+
+    def try_url(self, url: str) -> Tuple[Optional[str], str]:
+        """
+        Fetch a single URL with the configured backend.
+
+        Transient failures are retried as the retry policy allows, and every
+        request waits while the circuit breaker is open. Returns the channel
+        ID found (or None) and an error message if the request still failed
+        after its retries. Only a page that loaded without an ID, or a 404
+        for the page itself (any 4xx but 429 on the httpx backend, where the
+        page is the provider), is a miss: provider errors such as a rejected
+        API key, exhausted credits or the consent page are errors.
+        """
+        self.print_info(f"🔍 Trying {url}")
+        attempt = 0
+        while True:
+            with metrics.timer("circuit_wait"):
+                self.circuit.wait()
             try:
-                self.print_info(f"🔍 Trying {url}")
-
-                # Use Firecrawl to scrape the page
-                scrape_result = self.firecrawl.scrape_url(url, formats=['html'])
-                
-                # Debug: Print what we got back
-                if not scrape_result:
-                    self.print_error(f"No result returned from {url}")
-                    continue
-                
-                # Check if scraping was successful
-                if hasattr(scrape_result, 'success') and not scrape_result.success:
-                    error_msg = getattr(scrape_result, 'error', 'Unknown error')
-                    self.print_error(f"Scraping failed for {url}: {error_msg}")
-                    continue
-                
-                # Handle ScrapeResponse object
-                if scrape_result and hasattr(scrape_result, 'html') and scrape_result.html:
-                    html_content = scrape_result.html
-                    
-                    if html_content:
-                        channel_id = self.extract_channel_id_from_content(html_content)
-
-                        if channel_id:
-                            result.channel_id = channel_id
-                            result.url = f"https://www.youtube.com/channel/{channel_id}"
-                            result.status = "found"
-                            return result
-
-                # Rate limiting
-                time.sleep(self.delay)
-
+                with metrics.timer("fetch", backend=self.fetcher.name):
+                    channel_id = self.fetcher.fetch(url)
             except Exception as e:
-                error_msg = str(e) if str(e) != "None" else "HTTP Error"
-                result.error_msg = error_msg
-                self.print_error(f"Error scraping {url}: {error_msg}")
-                # Shorter delay for failed attempts, especially for non-/about URLs
-                delay = 0.2 if "/about" not in url else 0.5
-                time.sleep(delay)
+                error = e if isinstance(e, FetchError) else FetchError(str(e) or type(e).__name__)
+                metrics.inc("fetch_errors_total", backend=self.fetcher.name, status=str(error.status or "network"))
+                if self.circuit.record_failure():
+                    self.print_error(f"🔌 Provider failing, pausing requests for {self.circuit.cooldown:g}s")
+                delay = self.retry_policy.delay(error, attempt)
+                if delay is None:
+                    self.print_error(f"Error scraping {url}: {error}")
+                    return None, str(error)
+
+                self.print_info(f"⏳ {url}: {error}, retrying in {delay:.1f}s")
+                with metrics.timer("retry_sleep"):
+                    time.sleep(delay)
+                attempt += 1
                 continue
 
+            self.circuit.record_success()
+            metrics.inc("fetches_total", backend=self.fetcher.name, result="found" if channel_id else "miss")
+            return channel_id, ""
+
+    def scrape_channel_id(self, username: str) -> ChannelResult:
+        """
+        Scrape channel ID for a username using the fetch backend.
+
+        URL templates are tried @handle first, then legacy /c/ and /user/
+        names, each in order of their win rate so far (initially /about
+        endpoints first, as they're more reliable). With self.hedge above
+        one, that many templates race concurrently and the rest are cancelled
+        once the lookup is settled. A legacy name's hit is held until every
+        @handle URL has missed, so the stored channel never depends on which
+        request was faster. Usernames already in the channel cache are
+        answered without any requests.
+        """
+        if self.cache:
+            cached = self.cache.get(username)
+            if cached:
+                metrics.inc("channel_cache_hits_total")
+                return cached
+
+        result = ChannelResult(username=username)
+        name = username.replace("@", "")
+        urls = {template.format(handle=username, name=name): template for template in self.ordered_templates()}
+
+        outcomes = {}
+        executor = ThreadPoolExecutor(max_workers=max(1, self.hedge))
+        futures = {executor.submit(self.try_url, url): url for url in urls}
+        try:
+            for future in as_completed(futures):
+                template = urls[futures[future]]
+                channel_id, error_msg = outcomes[template] = future.result()
+                self.record_attempt(template, bool(channel_id))
+                if error_msg:
+                    result.error_msg = error_msg
+
+                settled, channel_id = self.settle(outcomes)
+                if channel_id:
+                    result.channel_id = channel_id
+                    result.url = f"https://www.youtube.com/channel/{channel_id}"
+                    result.status = "found"
+                    result.error_msg = ""
+                    if self.cache:
+                        self.cache.set(result)
+                    return result
+                if settled:
+                    break
+        finally:
+            # Don't wait for the losing variants, and never start the rest
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        # Requests that kept failing may have missed the channel, so leave it for a later run
+        if result.error_msg:
+            result.status = "error"
+            return result
+
         # If we get here, channel wasn't found
         result.status = "not_found"
         result.error_msg = "Channel not found with any URL format"
+        if self.cache:
+            self.cache.set(result)
         return result
 
     def get_pending_channels(self) -> List[str]:
-        """Get list of usernames that need scraping"""
-        return [
-            username
-            for username, channel in self.channels.items()
-            if channel.status == "pending"
-        ]
-
-    def get_stats(self) -> Tuple[int, int, int, int]:
-        """Get statistics: total, found, pending, not_found"""
-        total = len(self.channels)
-        found = sum(1 for c in self.channels.values() if c.status == "found")
-        pending = sum(1 for c in self.channels.values() if c.status == "pending")
-        not_found = sum(1 for c in self.channels.values() if c.status == "not_found")
-        return total, found, pending, not_found
+        """Get list of usernames that need scraping, including ones that errored last time"""
+        return self.channels.pending_usernames()
+
+    def get_stats(self) -> Tuple[int, int, int, int, int]:
+        """Get statistics: total, found, pending, not_found, error"""
+        channels = self.channels
+        return (
+            len(channels),
+            channels.count("found"),
+            channels.count("pending"),
+            channels.count("not_found"),
+            channels.count("error"),
+        )
 
     def print_stats(self):
         """Print current statistics"""
-        total, found, pending, not_found = self.get_stats()
+        total, found, pending, not_found, errors = self.get_stats()
 
         if RICH_AVAILABLE:
             stats_text = f"Found: {found}/{total} ({found / total * 100:.1f}%)"
@@ -257,6 +1099,8 @@ class FirecrawlYouTubeScraper:
                 stats_text += f" | Pending: {pending}"
             if not_found > 0:
                 stats_text += f" | Not Found: {not_found}"
+            if errors > 0:
+                stats_text += f" | Errors (retried next run): {errors}"
 
             self.console.print(Panel(stats_text, title="📊 Progress", style="blue"))
         else:
@@ -265,6 +1109,51 @@ class FirecrawlYouTubeScraper:
                 print(f"   Pending: {pending}")
             if not_found > 0:
                 print(f"   Not found: {not_found}")
+            if errors > 0:
+                print(f"   Errors (retried next run): {errors}")
+
+    def print_template_stats(self):
+        """Print how often each URL template found the channel"""
+        with self.stats_lock:
+            stats = [(template, dict(counts)) for template, counts in self.template_stats.items()]
+        stats = [(template, counts) for template, counts in stats if counts["attempts"]]
+        if not stats:
+            return
+
+        if RICH_AVAILABLE:
+            table = Table(title="URL template wins")
+            table.add_column("Template", style="cyan")
+            table.add_column("Wins", style="green", justify="right")
+            table.add_column("Attempts", justify="right")
+            for template, counts in stats:
+                table.add_row(template, str(counts["wins"]), str(counts["attempts"]))
+            self.console.print(table)
+        else:
+            print("\n🏁 URL template wins:")
+            for template, counts in stats:
+                print(f"   {counts['wins']:>5}/{counts['attempts']:<5} {template}")
+
+    def print_fetch_stats(self):
+        """Print requests, hits and bytes received by the fetch backend"""
+        with self.fetcher.stats_lock:
+            stats = [(name, dict(counts)) for name, counts in self.fetcher.stats.items()]
+        stats = [(name, counts) for name, counts in stats if counts["requests"]]
+        if not stats:
+            return
+
+        if RICH_AVAILABLE:
+            table = Table(title=f"{self.fetcher.name} fetches")
+            table.add_column("Fetch", style="cyan")
+            table.add_column("Hits", style="green", justify="right")
+            table.add_column("Requests", justify="right")
+            table.add_column("KB received", justify="right")
+            for name, counts in stats:
+                table.add_row(name, str(counts["hits"]), str(counts["requests"]), f"{counts['bytes'] / 1024:.1f}")
+            self.console.print(table)
+        else:
+            print(f"\n📦 {self.fetcher.name} fetches:")
+            for name, counts in stats:
+                print(f"   {counts['hits']:>5}/{counts['requests']:<5} {counts['bytes'] / 1024:>9.1f} KB  {name}")
 
     def print_results_table(self, limit: int = 20, status_filter: str = None):
         """Print results in table format"""
@@ -314,6 +1203,29 @@ class FirecrawlYouTubeScraper:
                     f"{channel.username:<20} {status_emoji} {channel.status:<10} {channel.channel_id}"
                 )
 
+    def iter_scrape_results(self, usernames: List[str]) -> Iterator[ChannelResult]:
+        """
+        Scrape usernames, yielding each result as soon as it completes.
+
+        Up to self.concurrency usernames are resolved at once; every request
+        still waits on the shared token bucket, so the overall request rate
+        never exceeds self.rate.
+        """
+        if self.concurrency <= 1:
+            for username in usernames:
+                yield self.scrape_channel_id(username)
+            return
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            futures = [executor.submit(self.scrape_channel_id, username) for username in usernames]
+            try:
+                for future in as_completed(futures):
+                    yield future.result()
+            finally:
+                # Don't start new lookups after an interrupt
+                for future in futures:
+                    future.cancel()
+
     def scrape_all_channels(self, resume: bool = False):
         """Scrape all pending channels"""
         if resume:
@@ -327,7 +1239,8 @@ class FirecrawlYouTubeScraper:
             return
 
         self.print_info(f"🚀 Starting to scrape {len(pending)} channels...")
-        self.print_info(f"⏱️  Delay between requests: {self.delay} seconds")
+        rate = f"{self.rate:g} requests/second" if self.rate > 0 else "unlimited"
+        self.print_info(f"⏱️  Rate limit: {rate}, concurrency: {self.concurrency}")
 
         if RICH_AVAILABLE:
             with Progress(
@@ -340,10 +1253,9 @@ class FirecrawlYouTubeScraper:
             ) as progress:
                 task = progress.add_task("Scraping channels...", total=len(pending))
 
-                for i, username in enumerate(pending):
-                    progress.update(task, description=f"Scraping {username}")
-
-                    result = self.scrape_channel_id(username)
+                for result in self.iter_scrape_results(pending):
+                    username = result.username
+                    progress.update(task, description=f"Scraped {username}")
                     self.channels[username] = result
 
                     # Print result
@@ -353,17 +1265,12 @@ class FirecrawlYouTubeScraper:
                         self.console.print(f"❌ {username} -> {result.status}")
 
                     progress.advance(task)
-
-                    # Save progress every 5 channels
-                    if (i + 1) % 5 == 0:
-                        self.save_progress()
-                        self.save_csv()
+                    self.record_progress(result)
 
         else:
-            for i, username in enumerate(pending, 1):
-                print(f"[{i}/{len(pending)}] Scraping {username}...")
-
-                result = self.scrape_channel_id(username)
+            for i, result in enumerate(self.iter_scrape_results(pending), 1):
+                username = result.username
+                print(f"[{i}/{len(pending)}] Scraped {username}")
                 self.channels[username] = result
 
                 if result.status == "found":
@@ -371,10 +1278,7 @@ class FirecrawlYouTubeScraper:
                 else:
                     print(f"❌ {result.status}: {result.error_msg}")
 
-                # Save progress every 5 channels
-                if i % 5 == 0:
-                    self.save_progress()
-                    self.save_csv()
+                self.record_progress(result)
 
         # Final save
         self.save_csv()
@@ -382,6 +1286,8 @@ class FirecrawlYouTubeScraper:
 
         self.print_success("🎉 Scraping completed!")
         self.print_stats()
+        self.print_template_stats()
+        self.print_fetch_stats()
 
     def export_glance_config(self):
         """Export found channels to Glance YAML format"""
@@ -393,11 +1299,9 @@ class FirecrawlYouTubeScraper:
             self.print_error("No channels found to export!")
             return
 
-        config_text = "- type: videos\n  channels:\n"
-        for channel in found_channels:
-            config_text += f"    - {channel.channel_id}  # {channel.username}\n"
+        config_text = GLANCE_HEADER + "".join(glance_entry(channel) for channel in found_channels)
 
-        config_file = self.output_file.replace(".csv", "_glance.yml")
+        config_file = self.glance_file
         try:
             with open(config_file, "w", encoding="utf-8") as f:
                 f.write(config_text)
@@ -432,14 +1336,38 @@ def main():
         description="YouTube Channel ID Scraper with Firecrawl"
     )
     parser.add_argument("csv_file", help="Path to CSV file with usernames")
+    parser.add_argument(
+        "-c", "--concurrency", type=int, help="Usernames resolved at once (default: FIRECRAWL_CONCURRENCY or 4)"
+    )
+    parser.add_argument(
+        "-r", "--rate", type=float, help="Maximum requests per second, 0 for unlimited (default: FIRECRAWL_RATE)"
+    )
+
+    parser.add_argument(
+        "--no-cache", action="store_true", help="Ignore and don't update the shared channel cache"
+    )
+    parser.add_argument(
+        "--backend", choices=FETCH_BACKENDS, help="How channel pages are fetched (default: FETCH_BACKEND or firecrawl)"
+    )
+    parser.add_argument(
+        "--base-url", help="Send httpx requests here instead of www.youtube.com, e.g. the fixture server"
+    )
 
     args = parser.parse_args()
+    metrics.serve()
 
     if not os.path.exists(args.csv_file):
         print(f"❌ File {args.csv_file} not found!")
         sys.exit(1)
 
-    scraper = FirecrawlYouTubeScraper(args.csv_file)
+    scraper = FirecrawlYouTubeScraper(
+        args.csv_file,
+        concurrency=args.concurrency,
+        rate=args.rate,
+        use_cache=False if args.no_cache else None,
+        backend=args.backend,
+        base_url=args.base_url,
+    )
 
     if not scraper.load_csv():
         sys.exit(1)
@@ -455,6 +1383,8 @@ def main():
         scraper.print_info("\n⏹️  Scraping interrupted. Progress saved.")
         scraper.save_progress()
         scraper.save_csv()
+    finally:
+        scraper.fetcher.close()
 
 
 if __name__ == "__main__":
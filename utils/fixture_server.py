@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+
+import argparse
+import base64
+import hashlib
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Optional
+
+
+"""
+Local stand-in for www.youtube.com that replays saved channel pages
+
+Serves the HTML fixtures in tests/fixtures/youtube with configurable latency,
+rate limiting and error rates, so the channel finder's concurrency and rate
+limit behaviour can be benchmarked offline with the httpx backend.
+
+A page is found by handle or name, so /@name, /@name/about, /c/name and
+/user/name all serve name.html or @name.html. With --synthesize, unknown
+names get the first fixture with its channel ID replaced by one derived
+from the name, so any CSV of usernames resolves. With --consent, requests
+without a consent cookie get a cookie prompt page instead, as in the EU.
+
+Usage:
+    python fixture_server.py --latency-ms 150 --error-rate 0.05
+    python channel_finder.py users.csv --backend httpx --base-url http://127.0.0.1:8766 --no-cache
+"""
+
+
+FIXTURES_DIR = Path(__file__).parent.parent / "tests" / "fixtures" / "youtube"
+
+EXTERNAL_ID_PATTERN = re.compile(r'"externalId":"(UC[a-zA-Z0-9_-]{22})"')
+
+CONSENT_PAGE = "<!DOCTYPE html><html><head><title>Before you continue to YouTube</title></head><body></body></html>"
+
+
+def page_name(path: str) -> Optional[str]:
+    """The lowercased handle or legacy name a YouTube URL path refers to"""
+    parts = [part for part in path.split("?", 1)[0].split("/") if part]
+    if parts and parts[0] in ("c", "user") and len(parts) > 1:
+        return parts[1].lower()
+    if parts and parts[0].startswith("@"):
+        return parts[0][1:].lower()
+    return None
+
+
+def synthetic_channel_id(name: str) -> str:
+    """A stable, valid looking channel ID for name"""
+    digest = base64.urlsafe_b64encode(hashlib.sha256(name.encode()).digest()).decode()
+    return "UC" + digest[:22]
+
+
+def load_pages(fixtures_dir: Path) -> Dict[str, str]:
+    """Saved pages keyed by lowercased name, without the leading @"""
+    return {
+        path.stem.lstrip("@").lower(): path.read_text(encoding="utf-8")
+        for path in sorted(fixtures_dir.glob("*.html"))
+    }
+
+
+class FixtureRequestHandler(BaseHTTPRequestHandler):
+    """Replays fixture pages, with the latency and failures set on the server"""
+
+    server_version = "fixture-server"
+
+    def do_GET(self):
+        server = self.server
+        time.sleep(max(0.0, random.gauss(server.latency, server.jitter)))
+
+        roll = random.random()
+        if roll < server.rate_limit_rate:
+            self.send_text(429, "Too many requests", retry_after=server.retry_after)
+            return
+        if roll < server.rate_limit_rate + server.error_rate:
+            self.send_text(503, "Service unavailable")
+            return
+
+        cookies = self.headers.get("Cookie", "")
+        if server.consent and "SOCS=" not in cookies and "CONSENT=YES" not in cookies:
+            self.send_text(200, CONSENT_PAGE, content_type="text/html")
+            return
+
+        name = page_name(self.path)
+        page = server.pages.get(name) if name else None
+        if page is None and name and server.synthesize and server.pages:
+            template = next(iter(server.pages.values()))
+            match = EXTERNAL_ID_PATTERN.search(template)
+            page = template.replace(match.group(1), synthetic_channel_id(name)) if match else template
+        if page is None:
+            self.send_text(404, "Not found")
+            return
+
+        self.send_text(200, page, content_type="text/html")
+        with server.lock:
+            server.served += 1
+
+    def send_text(
+        self, code: int, text: str, content_type: str = "text/plain", retry_after: Optional[float] = None
+    ):
+        body = text.encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        if retry_after is not None:
+            self.send_header("Retry-After", f"{retry_after:g}")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+def make_server(
+    host: str = "127.0.0.1",
+    port: int = 8766,
+    fixtures_dir: Path = FIXTURES_DIR,
+    latency: float = 0.0,
+    jitter: float = 0.0,
+    error_rate: float = 0.0,
+    rate_limit_rate: float = 0.0,
+    retry_after: float = 1.0,
+    synthesize: bool = False,
+    consent: bool = False,
+    verbose: bool = False,
+) -> ThreadingHTTPServer:
+    """Create the fixture server. Port 0 picks a free port"""
+    server = ThreadingHTTPServer((host, port), FixtureRequestHandler)
+    server.daemon_threads = True
+    server.pages = load_pages(fixtures_dir)
+    server.latency = latency
+    server.jitter = jitter
+    server.error_rate = error_rate
+    server.rate_limit_rate = rate_limit_rate
+    server.retry_after = retry_after
+    server.synthesize = synthesize
+    server.consent = consent
+    server.verbose = verbose
+    server.served = 0
+    server.lock = threading.Lock()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve saved YouTube pages for offline benchmarks")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8766, help="Port to listen on (default: 8766)")
+    parser.add_argument("--fixtures", default=str(FIXTURES_DIR), help="Directory of saved .html pages")
+    parser.add_argument("--latency-ms", type=float, default=100, help="Mean response delay (default: 100)")
+    parser.add_argument("--jitter-ms", type=float, default=30, help="Standard deviation of the delay (default: 30)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 503")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Fraction of requests answered with 429")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After seconds sent with 429s")
+    parser.add_argument(
+        "--synthesize", action="store_true", help="Serve a generated page for names without a fixture"
+    )
+    parser.add_argument(
+        "--consent", action="store_true", help="Serve a cookie consent page to requests without consent cookies"
+    )
+    parser.add_argument("-v", "--verbose", action="store_true", help="Log every request")
+    args = parser.parse_args()
+
+    server = make_server(
+        args.host,
+        args.port,
+        Path(args.fixtures),
+        latency=args.latency_ms / 1000,
+        jitter=args.jitter_ms / 1000,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        retry_after=args.retry_after,
+        synthesize=args.synthesize,
+        consent=args.consent,
+        verbose=args.verbose,
+    )
+    print(f"🎞️  Serving {len(server.pages)} pages on http://{args.host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\n⏹️  Served {server.served} pages")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
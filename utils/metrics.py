@@ -0,0 +1,195 @@
+import bisect
+import json
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from decouple import config
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+"""
+Timers, counters and histograms for finding where time goes
+
+Both main.py and channel_finder.py record into the module-level registry:
+
+    with metrics.timer("decode"):
+        ...
+    metrics.inc("ocr_cache_hits_total", engine="easyocr")
+
+Every timed stage lands in the stage_seconds histogram under its stage label.
+Events can be streamed as JSON lines, and the registry can be scraped in the
+Prometheus text format.
+
+Configuration via .env file:
+    METRICS_LOG=metrics.jsonl  # Optional, append a JSON line per event ("-" for stderr)
+    METRICS_PORT=9108  # Optional, serve Prometheus text format on /metrics
+    METRICS_PREFIX=yt_ocr  # Optional prefix for exported metric names
+"""
+
+
+# Upper bounds in seconds, from regex matches to slow network round trips
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    """Cumulative bucket counts, sum and count of observed values"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """(le, count) pairs as exported to Prometheus, ending with +Inf"""
+        total, pairs = 0, []
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            total += count
+            pairs.append(("+Inf" if bound == float("inf") else f"{bound:g}", total))
+        return pairs
+
+
+class Registry:
+    """Thread-safe store of counters and histograms, keyed by name and labels"""
+
+    def __init__(self, log_path: Optional[str] = None, prefix: str = ""):
+        self.counters: Dict[Tuple[str, Labels], float] = {}
+        self.histograms: Dict[Tuple[str, Labels], Histogram] = {}
+        self.lock = threading.Lock()
+        self.prefix = f"{prefix}_" if prefix else ""
+        self.log = None
+        if log_path == "-":
+            self.log = sys.stderr
+        elif log_path:
+            self.log = open(log_path, "a", encoding="utf-8")
+
+    def emit(self, event: str, name: str, value: float, labels: Labels):
+        """Write one event as a JSON line, if logging is on"""
+        if self.log is None:
+            return
+        line = json.dumps({"ts": round(time.time(), 6), "event": event, "name": name, "value": value, **dict(labels)})
+        with self.lock:
+            self.log.write(line + "\n")
+            self.log.flush()
+
+    def inc(self, name: str, value: float = 1, **labels):
+        """Add value to a counter"""
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+        self.emit("counter", name, value, key[1])
+
+    def observe(self, name: str, value: float, **labels):
+        """Record a value, usually seconds, in a histogram"""
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            histogram.observe(value)
+        self.emit("observe", name, value, key[1])
+
+    @contextmanager
+    def timer(self, stage: str, **labels) -> Iterator[None]:
+        """Time the body as a stage, recorded in stage_seconds even if it raises"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe("stage_seconds", time.perf_counter() - start, stage=stage, **labels)
+
+    def snapshot(self) -> dict:
+        """Counters and histogram totals as plain data, keyed by name{labels}"""
+        def key_name(name, labels):
+            return name + ("{" + ",".join(f"{k}={v}" for k, v in labels) + "}" if labels else "")
+
+        with self.lock:
+            return {
+                "counters": {key_name(*key): value for key, value in self.counters.items()},
+                "histograms": {
+                    key_name(*key): {"count": histogram.count, "sum": histogram.sum}
+                    for key, histogram in self.histograms.items()
+                },
+            }
+
+    def prometheus_text(self) -> str:
+        """The registry in the Prometheus text exposition format"""
+        def label_text(labels, extra=()):
+            pairs = list(labels) + list(extra)
+            if not pairs:
+                return ""
+            escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in pairs)
+            return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + "}"
+
+        lines = []
+        with self.lock:
+            for name in sorted({name for name, _ in self.counters}):
+                lines.append(f"# TYPE {self.prefix}{name} counter")
+                for (key, labels), value in sorted(self.counters.items()):
+                    if key == name:
+                        lines.append(f"{self.prefix}{name}{label_text(labels)} {value:g}")
+
+            for name in sorted({name for name, _ in self.histograms}):
+                lines.append(f"# TYPE {self.prefix}{name} histogram")
+                for (key, labels), histogram in sorted(self.histograms.items(), key=lambda item: item[0]):
+                    if key != name:
+                        continue
+                    for bound, count in histogram.cumulative():
+                        lines.append(f"{self.prefix}{name}_bucket{label_text(labels, [('le', bound)])} {count}")
+                    lines.append(f"{self.prefix}{name}_sum{label_text(labels)} {histogram.sum:g}")
+                    lines.append(f"{self.prefix}{name}_count{label_text(labels)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+
+class MetricsRequestHandler(BaseHTTPRequestHandler):
+    """Serves the registry on GET /metrics"""
+
+    def do_GET(self):
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404, "Not found")
+            return
+        body = self.server.registry.prometheus_text().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+REGISTRY = Registry(config("METRICS_LOG", default=None), config("METRICS_PREFIX", default="yt_ocr"))
+
+inc = REGISTRY.inc
+observe = REGISTRY.observe
+timer = REGISTRY.timer
+snapshot = REGISTRY.snapshot
+prometheus_text = REGISTRY.prometheus_text
+
+
+def serve(port: Optional[int] = None, host: str = "127.0.0.1") -> Optional[ThreadingHTTPServer]:
+    """
+    Serve /metrics from a background thread.
+
+    Uses METRICS_PORT when no port is given, and does nothing if neither is
+    set. Returns the server, or None when not serving.
+    """
+    port = port if port is not None else config("METRICS_PORT", default=None, cast=lambda v: int(v) if v else None)
+    if port is None:
+        return None
+    server = ThreadingHTTPServer((host, port), MetricsRequestHandler)
+    server.daemon_threads = True
+    server.registry = REGISTRY
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+